@@ -1,4 +1,14 @@
+import fnmatch
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress as supp
+
+import numpy as np
 from IPython.display import display, HTML
+
 from .tools import *
 
 
@@ -15,13 +25,98 @@ def reset(df):
     return df.reset_index(drop=True)
 
 
-def drop(df, cols):
+_COL_INDEX = {}
+
+
+def _col_index(columns):
+    """
+    Returns a `{column: [positions]}` map for a columns Index, cached per Index object (pandas
+    replaces the Index whenever columns change, so a live weakref means the map is still valid).
+    """
+    key = id(columns)
+    hit = _COL_INDEX.get(key)
+    if hit is not None and hit[0]() is columns:
+        return hit[1]
+    if len(_COL_INDEX) >= 256:
+        for k in [k for k, (ref, _) in _COL_INDEX.items() if ref() is None]:
+            del _COL_INDEX[k]
+        if len(_COL_INDEX) >= 256:
+            _COL_INDEX.clear()
+    index = {}
+    for pos, col in enumerate(columns):
+        index.setdefault(col, []).append(pos)
+    _COL_INDEX[key] = (weakref.ref(columns), index)
+    return index
+
+
+def select_cols(df, cols=None, dtype=None):
+    """
+    Resolves column selectors to column positions. Selectors can be exact names, globs (`"price_*"`),
+    compiled regexes (`re.compile("^id")`, matched with `.search`) or any mix of them in a list, and
+    can be narrowed down to given dtypes. Names that don't exist are ignored.
+
+    Args:
+        df (pd.DataFrame): DataFrame to reference
+        cols (str, list, re.Pattern): Column selectors (or comma-separated string of them), all
+            columns if `None`
+        dtype (str, type, list): Only select columns of these dtypes (anything `df.select_dtypes`
+            accepts as `include`, i.e. `"number"`, `"object"`, `["int64", "category"]`)
+
+    Returns:
+        list: Sorted positions of the selected columns
+
+    Example:
+        >>> select_cols(df, "animal,na*")
+        [0, 1]
+        >>> select_cols(df, dtype="number")
+        [2]
+    """
+    index = _col_index(df.columns)
+    if cols is None:
+        positions = set(range(len(df.columns)))
+    else:
+        if isinstance(cols, str):
+            cols = [i.strip() for i in cols.split(",")] if "," in cols else [cols]
+        elif isinstance(cols, re.Pattern):
+            cols = [cols]
+        positions = set()
+        for sel in cols:
+            if isinstance(sel, re.Pattern):
+                positions.update(
+                    p for col, pos in index.items() if sel.search(str(col)) for p in pos
+                )
+            elif sel in index:
+                positions.update(index[sel])
+            elif isinstance(sel, str) and any(c in sel for c in "*?["):
+                positions.update(
+                    p for col, pos in index.items() if fnmatch.fnmatchcase(str(col), sel)
+                    for p in pos
+                )
+    if dtype is not None:
+        # an empty slice keeps the dtypes without touching the data
+        typed = df.iloc[:0].select_dtypes(include=dtype).columns
+        positions &= {p for col in set(typed) for p in index[col]}
+    return sorted(positions)
+
+
+def _take_cols(df, positions):
+    if len(positions) == len(df.columns):
+        return df.iloc[:, :]  # still a view, but not the caller's object
+    if positions and positions[-1] - positions[0] + 1 == len(positions):
+        return df.iloc[:, positions[0]:positions[-1] + 1]  # contiguous, slice is a view
+    return df.iloc[:, positions]
+
+
+def drop(df, cols=None, dtype=None, inplace=False):
     """
     Drops given columns from a DataFrame (shortcut for `df.drop([cols],axis=1)`). Also works on lists.
+    Columns can be given as names, globs, regexes and/or dtypes (see `select_cols`).
 
     Args:
         df (pd.DataFrame, list): DataFrame or list to reference
-        cols (list): Columns/items to drop
+        cols (str, list, re.Pattern): Columns/items to drop
+        dtype (str, type, list): Drop columns of these dtypes (only the matching `cols` if given)
+        inplace (bool): If `True` the passed DataFrame is modified instead of returning a new one
 
     Returns:
         pd.DataFrame: The passed dataFrame/list with the given columns/items removed
@@ -46,32 +141,40 @@ def drop(df, cols):
         |  1 | dog      | Biscuit |
         |  2 | cat      | Binx    |
         ```
+
+        >>> drop(df, dtype="number")  # same result
     """
-    if isinstance(cols, str):
-        if "," in cols:
-            cols = [i.strip() for i in cols.split(",")]
-        else:
-            cols = [cols]
     if type(df) != list:
-        cols = [i for i in cols if i in list(df.columns)]
-        if not is_empty(cols):
-            return df.drop(cols, axis=1)
-        else:
+        if cols is None and dtype is None:
+            return df
+        dropped = set(select_cols(df, cols, dtype))
+        if not dropped:
+            return df
+        if inplace:
+            df.drop(columns=df.columns[sorted(dropped)], inplace=True)
             return df
+        return _take_cols(df, [i for i in range(len(df.columns)) if i not in dropped])
     else:
+        if cols is None:
+            return df
+        if isinstance(cols, str):
+            cols = [i.strip() for i in cols.split(",")] if "," in cols else [cols]
         for c in cols:
             with supp(ValueError):  # suppresses ValueErrors
                 df.remove(c)
         return df
 
 
-def keep(df, cols):
+def keep(df, cols=None, dtype=None):
     """
-    Shortcut for `df[[i for i in list(df.columns) if i in cols]]`.
+    Shortcut for `df[[i for i in list(df.columns) if i in cols]]`. Columns can be given as names,
+    globs, regexes and/or dtypes (see `select_cols`) and keep their original order. Contiguous
+    selections are returned as views rather than copies.
 
     Args:
         df (pd.DataFrame): DataFrame to reference
-        cols (list): Columns to keep
+        cols (str, list, re.Pattern): Columns to keep
+        dtype (str, type, list): Keep columns of these dtypes (only the matching `cols` if given)
 
     Returns:
         pd.DataFrame: The given dataframe with only the passed columns
@@ -96,14 +199,12 @@ def keep(df, cols):
         |  1 | dog      | Biscuit |
         |  2 | cat      | Binx    |
         ```
-    """
-    if type(cols) == str:
-        if "," in cols:
-            cols = [i.strip() for i in cols.split(",")]
-        else:
-            cols = [cols]
 
-    return df[[i for i in list(df.columns) if i in cols]]
+        >>> keep(df, "an*,na*")  # same result
+    """
+    if cols is None and dtype is None:
+        return df.iloc[:, []]
+    return _take_cols(df, select_cols(df, cols, dtype))
 
 
 def set_none(df):
@@ -119,17 +220,64 @@ def set_none(df):
     return df.where(~pd.isnull(df), None)
 
 
-def prettydf(df):
+_PAGE_CACHE = OrderedDict()
+
+
+def prettydf(df, page=None, page_size=50):
     """
-    Makes raw strings in a DataFrame printable strings.
+    Makes raw strings in a DataFrame printable strings. Only the rows on screen are rendered (the
+    head and tail, or a given page) along with the total number of rows and columns, so huge
+    DataFrames display instantly. Rendered pages are cached, so going back to a page is free.
 
     Args:
         df (pd.DataFrame): DataFrame to reference
+        page (int): Page number to show (starting at 1), shows the head and tail if `None`
+        page_size (int): Number of rows per page (split between head and tail when `page` is `None`),
+            `None` renders the whole DataFrame
 
     Returns:
         pd.DataFrame: A dataframe where strings are shown as printable strings not raw strings
+
+    Examples:
+        >>> prettydf(df)  # first and last 25 rows
+        >>> prettydf(df, page=3, page_size=100)  # rows 200-299
     """
-    return display(HTML(df.to_html().replace("\\n", "<br>")))
+    if page_size is None:
+        return display(HTML(df.to_html().replace("\\n", "<br>")))
+
+    rows = len(df)
+    pages = max(-(-rows // page_size), 1)
+    if page is not None and not 1 <= page <= pages:
+        raise ValueError(f"page must be between 1 and {pages}")
+
+    if page is None and rows > page_size:
+        head = page_size - page_size // 2
+        view = pd.concat([df.iloc[:head], df.iloc[rows - page_size // 2:]])
+        shown = f"rows 0-{head - 1:,} and {rows - page_size // 2:,}-{rows - 1:,}"
+    else:
+        start = (page - 1) * page_size if page else 0
+        view = df.iloc[start:start + page_size]
+        shown = f"page {page or 1} of {pages:,}"
+
+    # the visible rows' hash catches in-place edits that keep the id and shape of the frame
+    try:
+        token = int(pd.util.hash_pandas_object(view).sum())
+    except TypeError:  # unhashable cells (lists, dicts...), render without caching
+        token = None
+    key = (id(df), df.shape, tuple(df.columns), page, page_size, token)
+    hit = _PAGE_CACHE.get(key) if token is not None else None
+    if hit is not None and hit[0]() is df:
+        _PAGE_CACHE.move_to_end(key)
+        return display(HTML(hit[1]))
+
+    html = view.to_html().replace("\\n", "<br>")
+    html += f"<p>{rows:,} rows × {len(df.columns):,} columns ({shown})</p>"
+
+    if token is not None:
+        _PAGE_CACHE[key] = (weakref.ref(df), html)
+        if len(_PAGE_CACHE) > 32:
+            _PAGE_CACHE.popitem(last=False)
+    return display(HTML(html))
 
 
 def dedupe(df, cols=None, ix=False):
@@ -194,7 +342,370 @@ def dedupe(df, cols=None, ix=False):
             return reset(df.drop_duplicates())
 
 
-def todict(df, ix, cols=None):
+def _split_cols(cols):
+    if isinstance(cols, str):
+        return [i.strip() for i in cols.split(",")] if "," in cols else [cols]
+    return list(cols)
+
+
+class Pipeline:
+    """
+    Lazy chain of `drop`/`keep`/`dedupe`/`set_none`/`reset` and row filters on a DataFrame (see `lazy`).
+    Steps are only recorded until `collect` is called, which then optimises the plan:
+
+    - consecutive column selections are merged and column pruning is pushed before dedupes, filters
+      and `set_none`, so they only ever touch the columns that are still needed
+    - `set_none` runs once, after dedupes (but never past a filter, which may look at the nulls)
+    - redundant index resets are dropped and a reset right after a dedupe is done by the dedupe itself
+
+    A `dedupe` without columns and a filter without declared `cols` need every column present at
+    that point, so pruning can't move past them. Dtype selectors are resolved on the source dtypes.
+
+    Args:
+        df (pd.DataFrame): DataFrame to run the steps on
+
+    Attributes:
+        copies_avoided (int): After `collect`, number of intermediate DataFrames the eager
+            equivalent would have built that the optimised plan didn't
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.ops = []
+        self.copies_avoided = None
+
+    def _add(self, *op):
+        self.ops.append(op)
+        return self
+
+    def drop(self, cols=None, dtype=None):
+        """Lazy `drop` (see `drop`)."""
+        return self._add("drop", cols, dtype)
+
+    def keep(self, cols=None, dtype=None):
+        """Lazy `keep` (see `keep`)."""
+        return self._add("keep", cols, dtype)
+
+    def dedupe(self, cols=None, ix=False):
+        """Lazy `dedupe` (see `dedupe`)."""
+        return self._add("dedupe", None if cols is None else _split_cols(cols), ix)
+
+    def set_none(self):
+        """Lazy `set_none` (see `set_none`)."""
+        return self._add("set_none")
+
+    def reset(self):
+        """Lazy `reset` (see `reset`)."""
+        return self._add("reset")
+
+    def filter(self, func_or_query, cols=None):
+        """
+        Lazy row filter.
+
+        Args:
+            func_or_query (str, callable): `df.query` string or function taking the DataFrame and
+                returning a boolean mask of the rows to keep
+            cols (str, list): Columns the filter uses; lets column pruning move past the filter
+        """
+        return self._add("filter", func_or_query, None if cols is None else _split_cols(cols))
+
+    def _plan(self):
+        """Returns `(steps, final columns, eager copies)`; steps are `(op, needed columns, *args)`."""
+        proto = self.df.iloc[:0]
+        cols = list(proto.columns)
+        eager = 0
+        logical = []
+        for op, *args in self.ops:
+            if op in ("drop", "keep"):
+                view = proto[cols] if len(cols) != len(proto.columns) else proto
+                picked = set(view.columns[select_cols(view, args[0], args[1])])
+                if op == "drop" and picked:
+                    cols = [c for c in cols if c not in picked]
+                elif op == "keep":
+                    cols = [c for c in cols if c in picked]
+                eager += 1
+                continue
+            if op == "dedupe":
+                logical.append(("dedupe", cols, args[0]))
+                eager += 1
+                if not args[1]:
+                    logical.append(("reset", cols))
+                    eager += 1
+            else:
+                logical.append((op, cols, *args))
+                eager += 1
+
+        # reorder within filter-delimited windows: resets/set_none commute with column selections and
+        # dedupes don't care about index labels, so only the last reset of a window matters
+        steps = []
+        window = []
+        for step in logical + [("end", cols)]:
+            if step[0] not in ("filter", "end"):
+                window.append(step)
+                continue
+            last_reset = max((i for i, s in enumerate(window) if s[0] == "reset"), default=None)
+            seq = []
+            for i, s in enumerate(window):
+                if s[0] == "dedupe" or (s[0] == "reset" and i == last_reset):
+                    seq.append(list(s))
+            for i, s in enumerate(seq):
+                if s[0] == "reset" and i and seq[i - 1][0] == "dedupe":
+                    seq[i - 1].append(True)  # drop_duplicates(ignore_index=True)
+                    seq[i] = None
+            seq = [s for s in seq if s is not None]
+            if any(s[0] == "set_none" for s in window):
+                seq.append(["set_none", step[1]])
+            steps += seq + ([list(step)] if step[0] == "filter" else [])
+            window = []
+
+        # columns each step needs: what's left after it plus what it reads (everything if unknown)
+        need = set(cols)
+        for s in reversed(steps):
+            if s[0] in ("dedupe", "filter"):
+                uses = s[2] if s[0] == "dedupe" else s[3]
+                need = set(s[1]) if uses is None else need | set(uses)
+                s[1] = [c for c in s[1] if c in need]
+            else:
+                s[1] = list(need)
+        return steps, cols, eager
+
+    def explain(self):
+        """
+        Returns the optimised plan.
+
+        Returns:
+            list: Step descriptions in execution order
+        """
+        steps, cols, _ = self._plan()
+        out = []
+        for s in steps:
+            desc = s[0]
+            if s[0] == "dedupe":
+                desc += f"(cols={s[2]}{', ignore_index=True' if len(s) > 3 else ''})"
+            elif s[0] == "filter":
+                desc += f"({s[2] if isinstance(s[2], str) else getattr(s[2], '__name__', s[2])})"
+            out.append(f"{desc} on {len(s[1])} cols")
+        return out + [f"select {len(cols)} cols"]
+
+    def collect(self, verbose=False):
+        """
+        Runs the optimised plan.
+
+        Args:
+            verbose (bool): If `True` prints how many intermediate copies were avoided
+
+        Returns:
+            pd.DataFrame: The resulting DataFrame
+        """
+        steps, cols, eager = self._plan()
+        df = self.df
+        copies = 0
+
+        def project(df, wanted):
+            wanted = set(wanted)
+            if len(wanted) == len(df.columns):
+                return df, 0
+            if not wanted:
+                return df.iloc[:, []], 0
+            index = _col_index(df.columns)
+            positions = sorted(p for c in wanted for p in index[c])
+            out = _take_cols(df, positions)
+            return out, int(positions[-1] - positions[0] + 1 != len(positions))
+
+        for s in steps:
+            df, n = project(df, s[1])
+            copies += n
+            if s[0] == "dedupe":
+                df = df.drop_duplicates(subset=s[2], ignore_index=len(s) > 3)
+                if len(s) > 3 and not len(df.columns):
+                    df = reset(df)  # pandas skips ignore_index on frames without columns
+            elif s[0] == "reset":
+                df = reset(df)
+            elif s[0] == "set_none":
+                df = set_none(df)
+            elif isinstance(s[2], str):
+                df = df.query(s[2])
+            else:
+                df = df[s[2](df)]
+            copies += 1
+        df, n = project(df, cols)
+        copies += n
+        if df is self.df:
+            df = df.iloc[:, :]  # never hand back the source object itself
+        self.copies_avoided = eager - copies
+        if verbose:
+            green(f"{len(self.ops)} steps ran as {copies} copies ({self.copies_avoided} avoided)")
+        return df
+
+
+def lazy(df):
+    """
+    Starts a lazy `Pipeline` on a DataFrame; nothing runs until `.collect()`.
+
+    Args:
+        df (pd.DataFrame): DataFrame to reference
+
+    Returns:
+        Pipeline: An empty pipeline on `df`
+
+    Example:
+        >>> out = (
+        ...     lazy(df)
+        ...     .drop("notes")
+        ...     .set_none()
+        ...     .dedupe("animal,name")
+        ...     .keep("animal,name")
+        ...     .reset()
+        ...     .collect(verbose=True)
+        ... )
+        5 steps ran as 2 copies (4 avoided)
+    """
+    return Pipeline(df)
+
+
+def _read_chunks(sources, chunksize, read_kwargs):
+    for path in sources:
+        for chunk in pd.read_csv(path, chunksize=chunksize, **read_kwargs):
+            yield chunk
+
+
+def dedupe_files(sources, out_path, cols=None, chunksize=500000, mem_limit=1024, verify=False,
+                 tmp_dir=None, **read_kwargs):
+    """
+    Out-of-core version of `dedupe` for data split across many CSV files. Rows (or the given subset of
+    columns) are hashed chunk by chunk with `pd.util.hash_pandas_object` and only the 8 byte hashes are
+    kept, partitioned by hash and spilled to temp files whenever they exceed `mem_limit`. Each
+    partition is then deduped on its own and the first occurrence of every row is streamed out to
+    `out_path` in the original order.
+
+    Args:
+        sources (list, str): CSV file path(s) to dedupe (read in the given order)
+        out_path (str): Path of the CSV file the unique rows are written to
+        cols (list, str): Subset of columns to dedupe by
+        chunksize (int): Number of rows read at a time
+        mem_limit (int): Memory budget for the buffered hashes in MB (a 1 byte per row keep-mask is
+            held on top of this)
+        verify (bool): If `True` rows dropped as duplicates are compared to the row they matched, so
+            hash collisions never drop a row (costs extra memory for every duplicate group)
+        tmp_dir (str): Directory for the spilled hash partitions (system temp dir by default)
+        read_kwargs: Passed to `pd.read_csv` (values are read as strings unless `dtype` is passed)
+
+    Returns:
+        dict: Number of rows read, unique rows written, duplicates dropped and hash collisions found
+
+    Example:
+        >>> dedupe_files(["exports/part1.csv", "exports/part2.csv"], "deduped.csv", cols=["email"])
+    """
+    if isinstance(sources, str):
+        sources = [sources]
+    if isinstance(cols, str):
+        if "," in cols:
+            cols = [i.strip() for i in cols.split(",")]
+        else:
+            cols = [cols]
+    # read everything as text so the same row hashes the same in every file
+    read_kwargs.setdefault("dtype", str)
+
+    bits = 8
+    pair = np.dtype([("hash", "<u8"), ("row", "<u8")])
+    buffers = [[] for _ in range(2 ** bits)]
+    buffered = 0
+    tmp = tempfile.mkdtemp(prefix="alia_dedupe_", dir=tmp_dir)
+    part_path = lambda p: os.path.join(tmp, f"{p}.bin")
+
+    def spill():
+        for p, bufs in enumerate(buffers):
+            if bufs:
+                with open(part_path(p), "ab") as f:
+                    np.concatenate(bufs).tofile(f)
+                buffers[p] = []
+
+    try:
+        # pass 1: hash every row into partitions
+        n_rows = 0
+        for chunk in _read_chunks(sources, chunksize, read_kwargs):
+            h = pd.util.hash_pandas_object(chunk[cols] if cols else chunk, index=False).to_numpy()
+            part = (h >> np.uint64(64 - bits)).astype(np.intp)
+            order = np.argsort(part, kind="stable")
+            pairs = np.empty(len(chunk), dtype=pair)
+            pairs["hash"] = h[order]
+            pairs["row"] = np.arange(n_rows, n_rows + len(chunk), dtype=np.uint64)[order]
+            bounds = np.searchsorted(part[order], np.arange(2 ** bits + 1))
+            for p in np.flatnonzero(np.diff(bounds)):
+                buffers[p].append(pairs[bounds[p]: bounds[p + 1]])
+            n_rows += len(chunk)
+            buffered += pairs.nbytes
+            if buffered > mem_limit * 1024 ** 2:
+                spill()
+                buffered = 0
+
+        # pass 2: keep the first row of every hash, one partition at a time
+        keep = np.zeros(n_rows, dtype=bool)
+        dup_rows, rep_rows = [], []
+        for p in range(2 ** bits):
+            parts = buffers[p]
+            buffers[p] = []
+            if os.path.exists(part_path(p)):
+                parts.insert(0, np.fromfile(part_path(p), dtype=pair))
+            if not parts:
+                continue
+            arr = np.concatenate(parts)
+            arr = arr[np.lexsort((arr["row"], arr["hash"]))]
+            first = np.ones(len(arr), dtype=bool)
+            first[1:] = arr["hash"][1:] != arr["hash"][:-1]
+            keep[arr["row"][first]] = True
+            if verify and not first.all():
+                reps = arr["row"][first][np.cumsum(first) - 1]
+                dup_rows.append(arr["row"][~first])
+                rep_rows.append(reps[~first])
+
+        if dup_rows:
+            dups = np.concatenate(dup_rows)
+            order = np.argsort(dups)
+            dups, reps = dups[order], np.concatenate(rep_rows)[order]
+            rep_set = np.unique(reps)
+        else:
+            dups = reps = rep_set = np.empty(0, dtype=np.uint64)
+
+        # pass 3: stream the kept rows out in their original order
+        variants = {}
+        collisions = written = start = 0
+        header_written = False
+        with open(out_path, "w", newline="") as f:
+            for chunk in _read_chunks(sources, chunksize, read_kwargs):
+                rows = np.arange(start, start + len(chunk), dtype=np.uint64)
+                start += len(chunk)
+                mask = keep[rows.astype(np.intp)]
+                is_rep, is_dup = np.isin(rows, rep_set), np.isin(rows, dups)
+                if is_rep.any() or is_dup.any():
+                    sub = (chunk[cols] if cols else chunk).astype(object)
+                    values = list(sub.where(sub.notnull(), None).itertuples(index=False, name=None))
+                    for i in np.flatnonzero(is_rep):
+                        variants[rows[i]] = {values[i]}
+                    for i in np.flatnonzero(is_dup):
+                        seen = variants[reps[np.searchsorted(dups, rows[i])]]
+                        if values[i] not in seen:
+                            # same hash, different row
+                            seen.add(values[i])
+                            mask[i] = True
+                            collisions += 1
+                out = chunk[mask]
+                out.to_csv(f, header=not header_written, index=False)
+                header_written = True
+                written += len(out)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    green(f"Wrote {written:,} unique rows of {n_rows:,} to {out_path}", ts=False)
+    return {
+        "rows": n_rows,
+        "unique": written,
+        "duplicates": n_rows - written,
+        "collisions": collisions,
+    }
+
+
+def todict(df, ix, cols=None, orient=None, dupes="last"):
     """
     Creates a dictionary/map from a DataFrame.
 
@@ -202,6 +713,13 @@ def todict(df, ix, cols=None):
         df (pd.DataFrame): DataFrame to reference
         ix (str): The column to group by (becomes the keys of the returned dictionary
         cols (list): Columns of the DataFrame to include in the retuned dictionary
+        orient (str): Shape of the output, one of:
+            `columns` ({col: {key: val}}, default when `cols` isn't passed),
+            `rows` ({key: {col: val}}, default when multiple `cols` are passed),
+            `records` ({key: (val1, val2, ...)} in `cols` order);
+            a single column defaults to a flat {key: val} dictionary
+        dupes (str): What to do with duplicate keys: keep the `last` value (default), the `first` value
+            or raise an `error`
 
     Returns:
         dict: Dictionary created from the passed DataFrame grouping on the given `ix` value
@@ -228,76 +746,162 @@ def todict(df, ix, cols=None):
         ```
         {'dog': 'Biscuit', 'cat': 'Binx'}
         ```
+
+        >>> todict(df, "animal", cols="all", dupes="first")
+
+        ```
+        {'dog': {'name': 'Fido', 'age': 2}, 'cat': {'name': 'Binx', 'age': 5}}
+        ```
+
+        >>> todict(df, "name", cols=["animal", "age"], orient="records")
+
+        ```
+        {'Fido': ('dog', 2), 'Binx': ('cat', 5), 'Biscuit': ('dog', 6)}
+        ```
     """
-    def merge(df, ix, cols):
-        dicts = []
-        for c in cols:
-            exec(f"temp = df.set_index('{ix}')['{c}'].to_dict()")
-            dicts.append({k: {c: v} for k, v in locals()["temp"].items()})
-        dd = {}
-        for d in dicts:
-            for k, v in d.items():
-                if k not in keys(dd):
-                    dd[k] = {}
-                for y, z in v.items():
-                    dd[k][y] = z
-        return dd
+    if dupes not in ("first", "last", "error"):
+        raise ValueError("dupes must be 'first', 'last' or 'error'")
+    if orient not in (None, "columns", "rows", "records"):
+        raise ValueError("orient must be 'columns', 'rows' or 'records'")
+
+    if dupes == "error":
+        dup = df[ix].duplicated()
+        if dup.any():
+            raise ValueError(
+                f"Duplicate keys found in '{ix}': {quotify(unique(df.loc[dup, ix].astype(str))[:5])}"
+            )
+    elif dupes == "first":
+        df = df[~df[ix].duplicated(keep="first")]
 
     try:
-        if cols:
-            if type(cols) == str and cols.lower() == "all":
-                return merge(df, ix=ix, cols=[i for i in list(df.columns) if i != ix])
-            if type(cols) != list:
-                cols = [i.strip() for i in cols.split(",")]
-            if len(cols) == 1:
-                return df.set_index(ix)[cols[0]].to_dict()
-            else:
-                return merge(df, ix=ix, cols=cols)
+        if not cols:
+            cols = [i for i in list(df.columns) if i != ix]
+            orient = orient or "columns"
+        elif type(cols) == str and cols.lower() == "all":
+            cols = [i for i in list(df.columns) if i != ix]
+        elif type(cols) != list:
+            cols = [i.strip() for i in cols.split(",")]
+
+        # plain lists (native Python values) keep this to one pass over each column;
+        # on duplicate keys later rows overwrite earlier ones, same as `to_dict`
+        keys = df[ix].tolist()
+        vals = [df[c].tolist() for c in cols]
+        if orient is None:
+            orient = "rows" if len(cols) > 1 else None
+        if orient is None:
+            return dict(zip(keys, vals[0]))
+        elif orient == "columns":
+            return {c: dict(zip(keys, v)) for c, v in zip(cols, vals)}
+        elif orient == "rows":
+            return {k: dict(zip(cols, row)) for k, row in zip(keys, zip(*vals))}
         else:
-            return df.set_index(ix).to_dict()
+            return dict(zip(keys, zip(*vals)))
     except AttributeError:
         pass
     except Exception as e:
         red(f"<b>ERROR:</b>\n{e}", ts=False)
 
 
+def togroups(df, ix, cols=None, as_list=False, csr=False):
+    """
+    Creates a one-to-many map from a DataFrame where every key holds all of its values (unlike
+    `todict`, which keeps only one value per key). Keys are factorized and sorted once, so each
+    group is just a slice of the sorted values (no per-group pandas code). Null keys are skipped.
+
+    Args:
+        df (pd.DataFrame): DataFrame to reference
+        ix (str): The column to group by (becomes the keys of the returned dictionary)
+        cols (list, str): Columns whose values are collected (all other columns by default)
+        as_list (bool): If `True` the values are lists instead of NumPy arrays
+        csr (bool): If `True` a compact `(keys, offsets, values)` tuple is returned instead of a
+            dictionary, where the values of `keys[i]` are `values[offsets[i]:offsets[i + 1]]`
+
+    Returns:
+        dict|tuple: {key: values} for a single column, {key: {col: values}} for multiple columns
+        (or the CSR tuple, where values is an array or a {col: array} dict)
+
+    Examples:
+        Given a dataframe `df`:
+
+        ```
+        |    | animal   | name    |   age |
+        |----|----------|---------|-------|
+        |  0 | dog      | Fido    |     2 |
+        |  1 | cat      | Binx    |     5 |
+        |  2 | dog      | Biscuit |     6 |
+        ```
+
+        >>> togroups(df, "animal", "name", as_list=True)
+
+        ```
+        {'dog': ['Fido', 'Biscuit'], 'cat': ['Binx']}
+        ```
+
+        >>> togroups(df, "animal", "name", csr=True)
+
+        ```
+        (array(['dog', 'cat'], dtype=object), array([0, 2, 3]), array(['Fido', 'Biscuit', 'Binx'], dtype=object))
+        ```
+    """
+    if cols is None:
+        cols = [i for i in list(df.columns) if i != ix]
+    elif isinstance(cols, str):
+        if "," in cols:
+            cols = [i.strip() for i in cols.split(",")]
+        else:
+            cols = [cols]
+
+    codes, uniques = pd.factorize(df[ix])
+    positions = np.flatnonzero(codes >= 0)
+    order = positions[np.argsort(codes[positions], kind="stable")]
+    offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[positions], minlength=len(uniques)), out=offsets[1:])
+    values = {c: df[c].to_numpy()[order] for c in cols}
+
+    if csr:
+        keys = np.asarray(uniques, dtype=object)
+        if len(cols) == 1:
+            return keys, offsets, values[cols[0]]
+        return keys, offsets, values
+
+    if as_list:
+        values = {c: v.tolist() for c, v in values.items()}
+    bounds = list(zip(uniques.tolist(), offsets[:-1].tolist(), offsets[1:].tolist()))
+    if len(cols) == 1:
+        v = values[cols[0]]
+        return {k: v[start:stop] for k, start, stop in bounds}
+    return {k: {c: v[start:stop] for c, v in values.items()} for k, start, stop in bounds}
+
+
 def pdnull(series):
     """
-    Checks for null values in a series.
+    Checks for null values in a series (the same values `nullstr` treats as null, see `null_tokens`).
 
     Args:
-        series (pd.Series): Series to be reference
+        series (pd.Series, pd.DataFrame): Series to be reference
 
     Returns:
         pd.Series: A series of booleans indicating if the value of that index is null
     """
-    if type(series) == pd.DataFrame:
-        return (series.isnull()) | (
-            series.isin(["", None, "nan", "NaN", "None", "NaT", pd.NaT])
-        )
-    else:
-        fm = lambda x: pd.isnull(x) or x in [
-            "",
-            None,
-            "nan",
-            "NaN",
-            "None",
-            "NaT",
-            pd.NaT,
-        ]
-        return series.apply(fm)
+    return nullmask(series)
 
 
-def unique(series, as_list=True):
+def unique(series, as_list=True, count=False, approx=False, precision=14):
     """
-    Dedupes a given series or list.
+    Dedupes a given series or list. Can also count distinct values, either exactly or approximately
+    with a `HyperLogLog` sketch (bounded memory, for huge or chunked sources).
 
     Args:
-        series (pd.Series, list): Series or list to reference
+        series (pd.Series, list, iterable): Series, list or iterable (of values or Series/DataFrame chunks)
+            to reference
         as_list (bool): If `False` the output is printed instead of returned
+        count (bool): If `True` the number of unique values is returned instead of the values
+        approx (bool): If `True` the number of unique values is estimated with a `HyperLogLog` sketch
+            (implies `count=True`)
+        precision (int): Precision of the sketch when `approx=True` (see `HyperLogLog`)
 
     Returns:
-        list: A list containing unique values from the given series/list
+        list|int: A list containing unique values from the given series/list (or how many there are)
 
     Example:
         Given a series `animals`:
@@ -315,14 +919,602 @@ def unique(series, as_list=True):
         ```
         ['dog', 'cat']
         ```
+
+        >>> unique(animals, count=True)
+
+        ```
+        2
+        ```
+
+        >>> unique(pd.read_csv("events.csv", chunksize=100000, usecols=["user_id"]), approx=True)
+
+        ```
+        1048213
+        ```
     """
+    if approx:
+        return HyperLogLog(precision).update(series).count()
+
     if isinstance(series, pd.Series):
         out = list(series.unique())
     else:
         out_temp = set()
         out_add = out_temp.add
-        out = [x for x in series.copy() if not (x in out_temp or out_add(x))]
+        if isinstance(series, (list, tuple, np.ndarray)):
+            values = series
+        else:
+            # DataFrames and iterables of values and/or chunks (DataFrames are deduped by row, like
+            # approx=True)
+            def flatten(items):
+                for item in items:
+                    if isinstance(item, pd.Series):
+                        yield from item.unique()
+                    elif isinstance(item, pd.DataFrame):
+                        yield from item.drop_duplicates().itertuples(index=False, name=None)
+                    else:
+                        yield item
+
+            values = flatten([series] if isinstance(series, pd.DataFrame) else series)
+        out = [x for x in values if not (x in out_temp or out_add(x))]
+    if count:
+        return len(out)
     if as_list:
         return out
     else:
         print("\n".join(out))
+
+
+def _fernet_batch(key, values, decrypt=False):
+    """
+    Encrypts/decrypts a batch of values with a single Fernet key (module level so it can be pickled
+    to worker processes).
+
+    Args:
+        key (bytes): Fernet key
+        values (list): Values to encrypt/decrypt
+        decrypt (bool): If `True` values are decrypted instead of encrypted
+
+    Returns:
+        list: Encrypted tokens or decrypted strings
+    """
+    f = Fernet(key)
+    if decrypt:
+        return [
+            f.decrypt(v if isinstance(v, bytes) else str(v).encode()).decode() for v in values
+        ]
+    else:
+        return [f.encrypt(str(v).encode()).decode() for v in values]
+
+
+def _crypt_cols(df, cols, key, decrypt, suffix, inplace, batch_size, workers):
+    if isinstance(cols, str):
+        if "," in cols:
+            cols = [i.strip() for i in cols.split(",")]
+        else:
+            cols = [cols]
+    if not inplace:
+        df = df.copy()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    jobs = []
+    for c in cols:
+        nulls = pdnull(df[c]).to_numpy(dtype=bool)
+        values = df[c].to_numpy(dtype=object)[~nulls]
+        jobs.append((c, nulls, chunkify(values, batch_size)))
+
+    n_batches = sum(len(batches) for _, _, batches in jobs)
+    if workers > 1 and n_batches > 1:
+        executor = ProcessPoolExecutor(max_workers=min(workers, n_batches))
+        mapper = executor.map
+    else:
+        executor = None
+        mapper = map
+
+    try:
+        for c, nulls, batches in jobs:
+            out = np.full(len(df), None, dtype=object)
+            results = mapper(_fernet_batch, [key] * len(batches), batches, [decrypt] * len(batches))
+            out[~nulls] = [v for batch in results for v in batch]
+            df[f"{c}{suffix}" if suffix else c] = out
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return df
+
+
+def encrypt_cols(df, cols, key=None, suffix=None, inplace=False, batch_size=10000, workers=None):
+    """
+    Encrypts the given columns of a DataFrame with a single Fernet key. Rows are encrypted in
+    batches across worker processes and null values (see `pdnull`) are left null.
+
+    Args:
+        df (pd.DataFrame): DataFrame to reference
+        cols (list, str): Columns to encrypt
+        key (bytes): Fernet key to use (a new one is generated when `None`)
+        suffix (str): If passed encrypted values are saved as new `{col}{suffix}` columns instead of
+            overwriting the originals
+        inplace (bool): If `True` the passed DataFrame is modified instead of a copy
+        batch_size (int): Number of values encrypted per batch
+        workers (int): Number of worker processes (defaults to the CPU count, 1 runs serially)
+
+    Returns:
+        tuple: Encrypted DataFrame + associated encryption key (keep private!)
+
+    Example:
+        >>> df, key = encrypt_cols(df, ["email", "phone"])
+        >>> df = decrypt_cols(df, ["email", "phone"], key)
+    """
+    if key is None:
+        key = Fernet.generate_key()
+    df = _crypt_cols(
+        df, cols, key, decrypt=False, suffix=suffix, inplace=inplace,
+        batch_size=batch_size, workers=workers,
+    )
+    return df, key
+
+
+def decrypt_cols(df, cols, key, suffix=None, inplace=False, batch_size=10000, workers=None):
+    """
+    Decrypts columns encrypted by `encrypt_cols`. Null values are left null.
+
+    Args:
+        df (pd.DataFrame): DataFrame to reference
+        cols (list, str): Columns to decrypt
+        key (bytes): Associated encryption key
+        suffix (str): If passed decrypted values are saved as new `{col}{suffix}` columns instead of
+            overwriting the originals
+        inplace (bool): If `True` the passed DataFrame is modified instead of a copy
+        batch_size (int): Number of values decrypted per batch
+        workers (int): Number of worker processes (defaults to the CPU count, 1 runs serially)
+
+    Returns:
+        pd.DataFrame: The passed DataFrame with the given columns decrypted (as strings)
+    """
+    return _crypt_cols(
+        df, cols, key, decrypt=True, suffix=suffix, inplace=inplace,
+        batch_size=batch_size, workers=workers,
+    )
+
+
+def _as_series(data):
+    """
+    Wraps lists/arrays in a Series so they can be handled the same way as Series.
+
+    Args:
+        data (pd.Series, list, np.ndarray): Data to reference
+
+    Returns:
+        tuple: The data as a Series + whether or not it should be unwrapped back into an array
+    """
+    if isinstance(data, pd.Series):
+        return data, False
+    else:
+        return pd.Series(data), True
+
+
+def _unwrap(series, unwrap):
+    if unwrap:
+        return series.to_numpy(dtype=object)
+    else:
+        return series
+
+
+def _map_unique(series, func):
+    """
+    Applies a scalar function to each distinct non-null value of a Series only once and broadcasts
+    the results back with a single take (nulls are passed through as `NaN`). Mostly-unique Series
+    (judged from a sample) skip the factorizing and are mapped directly.
+
+    Args:
+        series (pd.Series): Series to reference
+        func (function): Scalar function to apply
+
+    Returns:
+        pd.Series: The mapped values
+    """
+    sample = series.iloc[:: max(1, len(series) // 10000)]
+    if len(sample) and sample.nunique() > len(sample) / 2:
+        vals = series.to_numpy(dtype=object)
+        nulls = pd.isnull(vals)
+        out = np.full(len(vals), np.nan, dtype=object)
+        out[~nulls] = [func(v) for v in vals[~nulls]]
+        return pd.Series(out, index=series.index, dtype=object)
+
+    codes, uniques = pd.factorize(series)
+    out = np.empty(len(uniques) + 1, dtype=object)
+    out[:-1] = [func(u) for u in uniques]
+    out[-1] = np.nan
+    # -1 (null) codes pick the trailing NaN
+    return pd.Series(out.take(codes), index=series.index, dtype=object)
+
+
+def pd_str_dedupe(data):
+    """
+    Series/array version of `str_dedupe` (removes duplicate substrings from every string).
+
+    Args:
+        data (pd.Series, list, np.ndarray): Strings to dedupe
+
+    Returns:
+        pd.Series|np.ndarray: Deduped strings (a Series if a Series was passed, otherwise an array)
+
+    Example:
+        >>> pd_str_dedupe(pd.Series(["The dog dog was cute", "cat cat"]))
+        0    The dog was cute
+        1                 cat
+        dtype: object
+    """
+    s, unwrap = _as_series(data)
+    return _unwrap(_map_unique(s, str_dedupe), unwrap)
+
+
+def pd_str_remove(data, rplc_strs):
+    """
+    Series/array version of `str_remove`.
+
+    Args:
+        data (pd.Series, list, np.ndarray): Strings to clean
+        rplc_strs (list): Strings to remove
+
+    Returns:
+        pd.Series|np.ndarray: Cleaned strings (a Series if a Series was passed, otherwise an array)
+
+    Example:
+        >>> pd_str_remove(["There were @3 dogs#", "#1"], ["@", "#"])
+        array(['There were 3 dogs', '1'], dtype=object)
+    """
+    if not isinstance(rplc_strs, list):
+        rplc_strs = [r.strip() for r in rplc_strs.split(",")]
+    s, unwrap = _as_series(data)
+    return _unwrap(_map_unique(s, Replacer(rplc_strs).sub), unwrap)
+
+
+def pd_str_replace(data, **rplc_map):
+    """
+    Series/array version of `str_replace`.
+
+    Args:
+        data (pd.Series, list, np.ndarray): Strings to clean
+        rplc_map (dict): Dict where the keys are what to replace and the values are what to replace it with
+
+    Returns:
+        pd.Series|np.ndarray: Strings with the desired replacements
+
+    Example:
+        >>> pd_str_replace(["cute cat", "beach cat"], **{"cat": "dog", "beach": "park"})
+        array(['cute dog', 'park dog'], dtype=object)
+    """
+    s, unwrap = _as_series(data)
+    return _unwrap(_map_unique(s, Replacer(rplc_map).sub), unwrap)
+
+
+def pd_currency_str(data):
+    """
+    Series/array version of `convert_curreny_str`. Values that can't be converted become `NaN`.
+
+    Args:
+        data (pd.Series, list, np.ndarray): Currency strings to convert
+
+    Returns:
+        pd.Series|np.ndarray: Numeric values of the currencies
+
+    Example:
+        >>> pd_currency_str(["$3,000", "$12.50"])
+        array([3000. ,   12.5])
+    """
+    s, unwrap = _as_series(data)
+    codes, uniques = pd.factorize(s)
+    nums = pd.to_numeric(
+        pd.Series(uniques, dtype=object).str.replace(r"[^\d.]", "", regex=True), errors="coerce"
+    ).to_numpy(dtype=float)
+    failed = int(np.isnan(nums).sum())
+    if failed:
+        red(f"Could not convert {failed} distinct value(s) to a number", ts=False)
+    out = np.append(nums, np.nan).take(codes)
+    if unwrap:
+        return out
+    else:
+        return pd.Series(out, index=s.index)
+
+
+def pd_nullstr(data):
+    """
+    Series/array version of `nullstr`.
+
+    Args:
+        data (pd.Series, list, np.ndarray): Values to check
+
+    Returns:
+        pd.Series|np.ndarray: Booleans indicating whether or not each value is truly null
+    """
+    return nullmask(data)
+
+
+def pd_blanknull(data):
+    """
+    Series/array version of `blanknull` (null and falsy values are converted to blank strings).
+
+    Args:
+        data (pd.Series, list, np.ndarray): Values to check
+
+    Returns:
+        pd.Series|np.ndarray: The passed values with nulls replaced by ""
+    """
+    s, unwrap = _as_series(data)
+    blank = pd_nullstr(s) | s.isin([0])
+    return _unwrap(s.astype(object).mask(blank, ""), unwrap)
+
+
+def _downcast(series, float32=False):
+    if series.dtype.kind in "iu":
+        if series.empty:
+            return series
+        return pd.to_numeric(series, downcast="unsigned" if series.min() >= 0 else "integer")
+    elif series.dtype.kind == "f" and series.dtype.itemsize > 4:
+        new = series.astype(np.float32)
+        # unless float32 is forced only keep it when every value survives the round trip
+        if float32 or np.array_equal(new.to_numpy(np.float64), series.to_numpy(), equal_nan=True):
+            return new
+    return series
+
+
+def _parse_numbers(nums, nulls, float32=False):
+    """Lines parsed numbers back up with their column; integers with nulls use nullable `Int*` dtypes."""
+    nums = _downcast(nums, float32)
+    if not nulls.any():
+        return pd.Series(nums.to_numpy(), index=nulls.index)
+    if nums.dtype.kind in "iu":
+        dtype = nums.dtype.name.replace("uint", "UInt").replace("int", "Int")
+        arr = pd.array(np.zeros(len(nulls), dtype=nums.dtype), dtype=dtype)
+        arr[~nulls.to_numpy()] = nums.to_numpy()
+        arr[nulls.to_numpy()] = pd.NA
+        return pd.Series(arr, index=nulls.index)
+    out = pd.Series(np.nan, index=nulls.index, dtype=nums.dtype)
+    out[~nulls.to_numpy()] = nums.to_numpy()
+    return out
+
+
+def optimize_dtypes(df, cat_threshold=0.5, parse_numbers=True, float32=False, inplace=False,
+                    verbose=True):
+    """
+    Shrinks a DataFrame's memory usage by downcasting numeric columns (i.e. `int64` -> `int8`),
+    parsing text columns that only hold numbers (see `is_float`) and converting low-cardinality
+    text columns to `category`.
+
+    Args:
+        df (pd.DataFrame): DataFrame to reference
+        cat_threshold (float): Text columns with at most this ratio of unique values to rows become categories
+        parse_numbers (bool): If `False` numeric-looking text columns are left as text
+        float32 (bool): If `True` every float column becomes `float32` (~7 significant digits), otherwise
+            only columns that can be stored as `float32` without losing precision are converted
+        inplace (bool): If `True` the passed DataFrame is modified instead of a copy
+        verbose (bool): If `True` memory usage before and after is printed
+
+    Returns:
+        tuple: Optimized DataFrame + dict of the original dtypes of every changed column (see `restore_dtypes`,
+        text columns parsed into numbers are recorded as `(dtype, "text")`)
+
+    Example:
+        >>> df, dtypes = optimize_dtypes(df)
+        Memory usage: 381.47 MB -> 48.64 MB (87% smaller)
+    """
+    before = df.memory_usage(deep=True).sum()
+    if not inplace:
+        df = df.copy()
+
+    dtypes = {}
+    for i, col in enumerate(df.columns):
+        s = df.iloc[:, i]
+        text = False
+        if pd.api.types.is_string_dtype(s.dtype):
+            nulls = nullmask(s)
+            vals = s[~nulls]
+            new = s
+            kind = pd.api.types.infer_dtype(vals, skipna=True) if not vals.empty else "empty"
+            if kind in ("integer", "floating") and not nulls.any():
+                # object column of real numbers, downcast without treating it as text
+                new = _downcast(pd.to_numeric(s), float32)
+            elif parse_numbers and kind == "string":
+                as_str = vals.astype(str)
+                if as_str.str.replace(".", "", regex=False).str.isnumeric().all():
+                    nums = pd.to_numeric(as_str, errors="coerce")
+                    # only parse when the text comes back unchanged (no leading/trailing zeros lost)
+                    if not nums.isnull().any() and (nums.astype(str) == as_str).all():
+                        new = _parse_numbers(nums, nulls, float32)
+                        text = True
+            if new is s and len(s):
+                try:
+                    if s.nunique(dropna=False) / len(s) <= cat_threshold:
+                        new = s.astype("category")
+                except TypeError:
+                    pass  # unhashable values (lists, dicts...) can't be categories
+        else:
+            new = _downcast(s, float32)
+        if new.dtype != s.dtype:
+            dtypes[col] = (s.dtype, "text") if text else s.dtype
+            df.isetitem(i, new)
+
+    if verbose:
+        after = df.memory_usage(deep=True).sum()
+        saved = 1 - after / before if before else 0
+        green(
+            f"Memory usage: {before / 1024 ** 2:.2f} MB -> {after / 1024 ** 2:.2f} MB ({saved:.0%} smaller)",
+            ts=False,
+        )
+    return df, dtypes
+
+
+def restore_dtypes(df, dtypes, inplace=False):
+    """
+    Reverts columns changed by `optimize_dtypes` back to their original dtypes. Text columns that
+    were parsed into numbers come back as the string form of those numbers.
+
+    Args:
+        df (pd.DataFrame): DataFrame to reference
+        dtypes (dict): Original dtypes returned by `optimize_dtypes`
+        inplace (bool): If `True` the passed DataFrame is modified instead of a copy
+
+    Returns:
+        pd.DataFrame: The DataFrame with its original dtypes
+    """
+    if not inplace:
+        df = df.copy()
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        if isinstance(dtype, tuple):
+            dtype = dtype[0]
+            s = s.astype(object).map(lambda x: None if pd.isnull(x) else str(x))
+        df[col] = s.astype(dtype)
+    return df
+
+
+_DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%m-%d-%Y",
+    "%d-%m-%Y",
+    "%d-%b-%Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M %p",
+]
+_BOOL_MAP = {
+    "true": True, "false": False, "t": True, "f": False,
+    "yes": True, "no": False, "y": True, "n": False,
+}
+_INT_RGX = r"[+-]?\d+"
+_FLOAT_RGX = r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?"
+
+
+def _infer_type(vals):
+    """
+    Infers the type of a sample of (non-null) strings.
+
+    Returns:
+        tuple: Type name + date format (`None` unless a date/datetime format was detected)
+    """
+    if vals.empty:
+        return "null", None
+    if vals.str.fullmatch(_FLOAT_RGX).all():
+        # leading zeros (zip codes, ids, etc.) would be lost as numbers or misread as dates
+        if vals.str.match(r"[+-]?0\d").any():
+            return "str", None
+        if vals.str.fullmatch(_INT_RGX).all():
+            return "int", None
+        return "float", None
+    if vals.str.lower().isin(list(_BOOL_MAP)).all():
+        return "bool", None
+    if not vals.str.contains(r"\d").all():
+        return "str", None
+
+    for fmt in _DATE_FORMATS:
+        if pd.to_datetime(vals, format=fmt, errors="coerce").notnull().all():
+            time_parts = ("%H", "%I", "%M", "%S", "%f")
+            return ("datetime" if any(i in fmt for i in time_parts) else "date"), fmt
+    try:
+        parsed = [todt(v) for v in vals]
+    except (ValueError, OverflowError):
+        return "str", None
+    if all(p.hour == p.minute == p.second == p.microsecond == 0 for p in parsed):
+        return "date", None
+    return "datetime", None
+
+
+def infer_schema(df, sample=1000, seed=0):
+    """
+    Infers column types of a DataFrame of strings (or `read_csv` rows) from a sample of each column.
+    Detects ints, floats, bools, dates/datetimes (with their format) and all-null columns; null
+    tokens (see `null_tokens`) are ignored while inferring.
+
+    Args:
+        df (pd.DataFrame, list): DataFrame or list of row dictionaries to reference
+        sample (int): Number of rows to sample per column
+        seed (int): Random seed for the sample
+
+    Returns:
+        dict: Column names mapped to `{"type": ..., "format": ..., "nulls": ...}` (see `apply_schema`),
+        where type is one of int, float, bool, date, datetime, str or null and nulls is the number of
+        null values in the sample
+
+    Example:
+        >>> infer_schema(read_csv("pets.csv"))
+        {'name': {'type': 'str', 'format': None, 'nulls': 0},
+         'age': {'type': 'int', 'format': None, 'nulls': 2},
+         'adopted': {'type': 'date', 'format': '%m/%d/%Y', 'nulls': 0}}
+    """
+    if not isinstance(df, pd.DataFrame):
+        df = pd.DataFrame(df)
+    if len(df) > sample:
+        df = df.sample(n=sample, random_state=seed)
+
+    schema = {}
+    for col in df.columns:
+        s = df[col]
+        nulls = nullmask(s)
+        vals = s[~nulls].astype(str).str.strip()
+        col_type, fmt = _infer_type(vals)
+        schema[col] = {"type": col_type, "format": fmt, "nulls": int(nulls.sum())}
+    return schema
+
+
+def apply_schema(df, schema, inplace=False):
+    """
+    Casts columns to the types in a schema from `infer_schema`, one vectorized cast per column. Null
+    tokens become real nulls and values that don't fit the type become null.
+
+    Args:
+        df (pd.DataFrame, list): DataFrame or list of row dictionaries to cast
+        schema (dict): Schema returned by `infer_schema`
+        inplace (bool): If `True` the passed DataFrame is modified instead of a copy
+
+    Returns:
+        pd.DataFrame: The DataFrame with the schema applied (ints use the nullable `Int64` dtype and
+        bools the nullable `boolean` dtype)
+    """
+    if not isinstance(df, pd.DataFrame):
+        df = pd.DataFrame(df)
+    elif not inplace:
+        df = df.copy()
+
+    for col, spec in schema.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        s = s.mask(nullmask(s))
+        col_type = spec["type"]
+        if col_type == "int":
+            # parsed straight from text so big ids never go through float64, "12.0" still counts
+            # as an integer and anything non-integral becomes null
+            txt = s.astype(str).str.strip().str.replace(r"\.0*$", "", regex=True)
+            ok = txt.str.fullmatch(_INT_RGX) & s.notnull()
+            long = ok & (txt.str.len() >= 19)
+            if long.any():  # out of Int64's range, would overflow
+                ok[long] = txt[long].map(lambda x: -2 ** 63 <= int(x) < 2 ** 63)
+            txt = txt.where(ok)
+            s = pd.to_numeric(txt, errors="coerce", dtype_backend="numpy_nullable").astype("Int64")
+        elif col_type == "float":
+            s = pd.to_numeric(s, errors="coerce")
+        elif col_type == "bool":
+            s = s.astype(str).str.strip().str.lower().map(_BOOL_MAP).astype("boolean")
+        elif col_type in ("date", "datetime"):
+            if spec.get("format"):
+                s = pd.to_datetime(s, format=spec["format"], errors="coerce")
+            else:
+                s = pd.to_datetime(s, format="mixed", errors="coerce")
+        df[col] = s
+    return df
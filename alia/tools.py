@@ -2,10 +2,22 @@ import base64
 import calendar
 import csv
 import difflib
+import fnmatch
+import hashlib
+import heapq
 import os
 import pickle
+import sys
+import time
+import traceback
+from collections import Counter, deque
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import date, timedelta
+from functools import lru_cache, partial
+from itertools import islice
 
+import numpy as np
 import pandas as pd
 import pyperclip
 from cryptography.fernet import Fernet
@@ -523,10 +535,37 @@ def filldates(start, end=None, as_str=False, weekends=True):
         return dd
 
 
+NULL_TOKENS = {"", "nan", "NaN", "None", "NONE", "NaT", "N/A", "#N/A"}
+
+
+def null_tokens(add=None, remove=None):
+    """
+    Views or updates the strings treated as null by `nullstr`, `nullmask` and `pdnull`.
+
+    Args:
+        add (list, str): Tokens to start treating as null
+        remove (list, str): Tokens to stop treating as null
+
+    Returns:
+        list: The current null tokens
+
+    Example:
+        >>> null_tokens(add=["-", "n/a"])
+        ['', '#N/A', '-', 'N/A', 'NONE', 'NaN', 'NaT', 'None', 'n/a', 'nan']
+    """
+    if isinstance(add, str):
+        add = [add]
+    if isinstance(remove, str):
+        remove = [remove]
+    NULL_TOKENS.update(add or [])
+    NULL_TOKENS.difference_update(remove or [])
+    return sorted(NULL_TOKENS)
+
+
 def nullstr(string):
     """
     More robust way of checking if a string is null even in cases where things like '#N/A'
-    are present.
+    are present (see `null_tokens`).
 
     Args:
         string (str): String to check
@@ -534,9 +573,30 @@ def nullstr(string):
     Returns:
         bool: Dictates whether or not the passed string is truly null
     """
-    return bool(
-        pd.isnull(string) or string in ["", None, "nan", "NaN", "None", "NONE", "N/A", "#N/A"]
-    )
+    return bool(pd.isnull(string) or (isinstance(string, str) and string in NULL_TOKENS))
+
+
+def nullmask(obj):
+    """
+    Vectorized version of `nullstr` for Series, DataFrames and arrays. Real nulls are found with
+    `isna` and null tokens with a hashed `isin` (only on text/categorical columns).
+
+    Args:
+        obj (pd.Series, pd.DataFrame, np.ndarray, list): Values to check
+
+    Returns:
+        pd.Series|pd.DataFrame|np.ndarray: Booleans (same shape as the input) indicating which values are null
+    """
+    if isinstance(obj, pd.DataFrame):
+        masks = {i: nullmask(obj.iloc[:, i]).to_numpy() for i in range(obj.shape[1])}
+        return pd.DataFrame(masks, index=obj.index).set_axis(obj.columns, axis=1)
+    elif isinstance(obj, pd.Series):
+        mask = obj.isna()
+        if pd.api.types.is_string_dtype(obj.dtype) or isinstance(obj.dtype, pd.CategoricalDtype):
+            mask |= obj.isin(NULL_TOKENS)
+        return mask
+    else:
+        return nullmask(pd.Series(np.asarray(obj, dtype=object))).to_numpy()
 
 
 def blanknull(string):
@@ -601,34 +661,110 @@ def iseven(num):
     return (num % 2) == 0
 
 
-def regex(string, pattern, ignore_case=False):
+@lru_cache(maxsize=512)
+def _compile_regex(pattern, flags):
+    return re.compile(pattern, flags)
+
+
+def compile_regex(pattern, ignore_case=False):
+    """
+    Compiles a regex pattern, reusing previously compiled patterns from a bounded cache.
+
+    Args:
+        pattern (str, re.Pattern): Regex pattern (or an already compiled pattern)
+        ignore_case (bool): Whether or not to use re.IGNORECASE
+
+    Returns:
+        re.Pattern: The compiled pattern
+    """
+    if isinstance(pattern, str):
+        return _compile_regex(pattern, re.IGNORECASE if ignore_case else 0)
+    elif ignore_case and not pattern.flags & re.IGNORECASE:
+        return _compile_regex(pattern.pattern, pattern.flags | re.IGNORECASE)
+    else:
+        return pattern
+
+
+def regex(string, pattern, ignore_case=False, group=1):
     """
     Performs a regex extraction of a given string.
 
     Args:
-        string (str, re.compile): String or compiled re object to reference
-        pattern (str): Regex pattern to search the string with
+        string (str): String to reference
+        pattern (str, re.Pattern): Regex pattern (or compiled re object) to search the string with
         ignore_case (bool): Whether or not to use re.IGNORECASE
+        group (int, str, None): Group to extract (number or name), `None` returns all named groups as a dict
 
     Returns:
         str: Extracted output of the passed regex
 
-    Example:
+    Examples:
         >>> regex("There were 3 pups at the park", "(\d+)")
         '3'
+
+        >>> regex("There were 3 pups", "(?P<num>\d+) (?P<animal>\w+)", group=None)
+        {'num': '3', 'animal': 'pups'}
     """
-    try:
-        if isinstance(pattern, str):
-            if ignore_case:
-                return re.search(pattern, string, re.IGNORECASE).group(1)
-            else:
-                return re.search(pattern, string).group(1)
-        elif ignore_case:
-            return pattern.search(string, re.IGNORECASE).group(1)
-        else:
-            return pattern.search(string).group(1)
-    except AttributeError:
+    match = compile_regex(pattern, ignore_case).search(string)
+    if match is None:
         print("Nothing matches the given regex pattern in the given string")
+        return None
+    elif group is None:
+        return match.groupdict()
+    else:
+        return match.group(group)
+
+
+def regex_extract(data, pattern, ignore_case=False, group=1):
+    """
+    Batch version of `regex` for lists, arrays and Series. Non-matches (and non-strings) become
+    `None` and nothing is printed, so the output always lines up with the input.
+
+    Args:
+        data (list, np.ndarray, pd.Series): Strings to reference
+        pattern (str, re.Pattern): Regex pattern (or compiled re object) to search each string with
+        ignore_case (bool): Whether or not to use re.IGNORECASE
+        group (int, str, None): Group to extract (number or name), `None` extracts every named group
+
+    Returns:
+        np.ndarray|pd.Series|pd.DataFrame: Extracted values (a Series if a Series was passed), or a
+        DataFrame with one column per named group when `group=None`
+
+    Examples:
+        >>> regex_extract(["id=3", "nothing", "id=12"], r"id=(\d+)")
+        array(['3', None, '12'], dtype=object)
+
+        >>> regex_extract(["GET /a 200", "POST /b 404"], r"(?P<method>\w+) (?P<path>\S+)", group=None)
+        ```
+        |    | method   | path   |
+        |----|----------|--------|
+        |  0 | GET      | /a     |
+        |  1 | POST     | /b     |
+        ```
+    """
+    rgx = compile_regex(pattern, ignore_case)
+    search = rgx.search
+    is_series = isinstance(data, pd.Series)
+    vals = data.to_numpy(dtype=object) if is_series else data
+    index = data.index if is_series else None
+    matches = [search(i) if isinstance(i, str) else None for i in vals]
+
+    if group is None:
+        if not rgx.groupindex:
+            raise ValueError("group=None requires a pattern with named groups")
+        out = {}
+        for name in rgx.groupindex:
+            col = np.empty(len(matches), dtype=object)
+            col[:] = [m.group(name) if m is not None else None for m in matches]
+            out[name] = col
+        return pd.DataFrame(out, index=index)
+
+    out = np.empty(len(matches), dtype=object)
+    out[:] = [m.group(group) if m is not None else None for m in matches]
+    if is_series:
+        return pd.Series(out, index=index, dtype=object)
+    else:
+        return out
 
 
 def str_dedupe(txt):
@@ -656,7 +792,7 @@ def str_dedupe(txt):
 
 def str_remove(txt, rplc_strs):
     """
-    Removes passed strings from a string.
+    Removes passed strings from a string in a single pass (see `Replacer`).
 
     Args:
         txt (str): String to clean
@@ -671,15 +807,13 @@ def str_remove(txt, rplc_strs):
     """
     if not isinstance(rplc_strs, list):
         rplc_strs = [r.strip() for r in rplc_strs.split(",")]
-    ntxt = txt
-    for i in rplc_strs:
-        ntxt = ntxt.replace(i, "")
-    return ntxt
+    return Replacer(rplc_strs).sub(txt)
 
 
 def str_replace(txt, **rplc_map):
     """
-    Replaces things in a string.
+    Replaces things in a string. All replacements happen in a single pass (see `Replacer`), so
+    replaced text is never replaced again.
 
     Args:
         txt (str): String to clean
@@ -692,10 +826,103 @@ def str_replace(txt, **rplc_map):
         >>> str_replace("There was a cute cat at the beach", **{"cat": "dog", "beach": "park"})
         'There was a cute dog at the park'
     """
-    out = txt
-    for k, v in rplc_map.items():
-        out = out.replace(k, v)
-    return out
+    return Replacer(rplc_map).sub(txt)
+
+
+class Replacer:
+    """
+    Compiled multi-pattern replacer. The patterns are combined into a single alternation regex
+    (longest patterns first) so text is scanned once no matter how many patterns there are, the
+    longest match wins at each position and replaced text is never replaced again. Build it once
+    and reuse it across strings, lists and Series.
+
+    Args:
+        rplc_map (dict, list): Dict where the keys are what to replace and the values are what to
+            replace it with (a list of strings removes them)
+        ignore_case (bool): Whether or not to match regardless of capitalization
+
+    Examples:
+        >>> rp = Replacer({"cat": "dog", "dog": "bird", "cats": "dogs"})
+        >>> rp("cats chase dogs and the cat")
+        'dogs chase birds and the dog'
+
+        >>> rp(["cat", None, "a dog"])
+        ['dog', None, 'a bird']
+    """
+
+    def __init__(self, rplc_map, ignore_case=False):
+        if not isinstance(rplc_map, dict):
+            rplc_map = {k: "" for k in rplc_map}
+        rplc_map = {str(k): str(v) for k, v in rplc_map.items() if k != ""}
+        self.ignore_case = ignore_case
+        self._keys = sorted(rplc_map, key=len, reverse=True)
+        self._map = rplc_map
+        if ignore_case:
+            # casefolded keys cover most case-insensitive matches, keys that fold to the same
+            # string are left out and resolved in _repl
+            folded = {}
+            for k in rplc_map:
+                folded.setdefault(k.casefold(), []).append(k)
+            self._lookup = {f: rplc_map[ks[0]] for f, ks in folded.items() if len(ks) == 1}
+        else:
+            self._lookup = rplc_map
+        if rplc_map:
+            keys = self._keys
+            self.pattern = re.compile(
+                "|".join(map(re.escape, keys)), re.IGNORECASE if ignore_case else 0
+            )
+        else:
+            self.pattern = None
+
+    def _repl(self, match):
+        if not self.ignore_case:
+            return self._lookup[match.group(0)]
+        text = match.group(0)
+        try:
+            return self._lookup[text.casefold()]
+        except KeyError:
+            # unicode case rules don't always map back to the key (i.e. 'ſ' matches 's'), find the
+            # key the pattern matched the same way the alternation does (longest first)
+            for key in self._keys:
+                if re.fullmatch(re.escape(key), text, re.IGNORECASE):
+                    return self._map[key]
+            return text
+
+    def sub(self, txt):
+        """
+        Applies the replacements to a single string.
+
+        Args:
+            txt (str): String to clean
+
+        Returns:
+            str: The passed string with the desired replacements
+        """
+        if self.pattern is None:
+            return txt
+        return self.pattern.sub(self._repl, txt)
+
+    def __call__(self, data):
+        """
+        Applies the replacements to a string, list, array or Series (nulls are left as-is).
+
+        Args:
+            data (str, list, np.ndarray, pd.Series): Text to clean
+
+        Returns:
+            str|list|np.ndarray|pd.Series: Cleaned text in the same container type that was passed
+        """
+        if isinstance(data, str):
+            return self.sub(data)
+        elif isinstance(data, pd.Series):
+            return data.map(self.sub, na_action="ignore")
+        out = [self.sub(i) if isinstance(i, str) else i for i in data]
+        if isinstance(data, np.ndarray):
+            return np.array(out, dtype=object)
+        return out
+
+    def __repr__(self):
+        return f"Replacer({len(self._map)} patterns, ignore_case={self.ignore_case})"
 
 
 def contains(ref, checklist, exact=True, show_all=True):
@@ -704,8 +931,10 @@ def contains(ref, checklist, exact=True, show_all=True):
 
     Args:
         ref (list): List of reference items to check
-        checklist (list): List of things to look for in ref
+        checklist (list, Matcher): List of things to look for in ref (pass a prebuilt `Matcher` when
+            checking against the same list repeatedly)
         exact (bool): If False checklist is lowercased to find matches regardless of captilization/trailing spaces
+            (ignored when checklist is a `Matcher`)
         show_all (bool): If False only the first matching item is returned, otherwise everything is
 
     Returns:
@@ -718,28 +947,43 @@ def contains(ref, checklist, exact=True, show_all=True):
         >>> contains(["dog", "cat", "ferret", "rat"], ["dog", "rat"], show_all=False)
         ['dog']
     """
-    if not isinstance(checklist, list) and not isinstance(checklist, str):
+    if not isinstance(checklist, (list, str, Matcher)):
         # account for Series and whatnot
         checklist = list(checklist)
 
-    if not exact:
-        checklist = [str(i).lower().strip() for i in checklist]
-
     if isinstance(ref, str):
         if "," in ref and ref.strip() != ",":
             ref = [i.strip() for i in ref.split(",")]
         else:
             ref = [ref]
 
-    dd = []
-    if exact:
-        for i in ref:
-            if i in checklist:
-                dd.append(i)
+    if isinstance(checklist, Matcher):
+        dd = checklist.find(ref)
     else:
-        for i in ref:
-            if str(i).lower().strip() in checklist:
-                dd.append(i)
+        if not exact:
+            checklist = [str(i).lower().strip() for i in checklist]
+        items = checklist
+        if not isinstance(checklist, str):
+            try:
+                checklist = set(checklist)
+            except TypeError:
+                pass  # unhashable items, fall back to list lookups
+
+        def found(item):
+            try:
+                return item in checklist
+            except TypeError:  # unhashable item, fall back to a list lookup
+                return item in items
+
+        dd = []
+        if exact:
+            for i in ref:
+                if found(i):
+                    dd.append(i)
+        else:
+            for i in ref:
+                if str(i).lower().strip() in checklist:
+                    dd.append(i)
 
     if len(dd) == 0:
         pink("None of the items passed were found in given list",ts=False)
@@ -751,6 +995,655 @@ def contains(ref, checklist, exact=True, show_all=True):
         return out
 
 
+class Matcher:
+    """
+    Prebuilt membership index for repeated `contains`-style lookups against the same checklist.
+    The checklist is normalized and hashed once, so every lookup afterwards is O(1) per item.
+
+    Args:
+        checklist (list, pd.Series, set): Things to look for
+        exact (bool): If False matches are found regardless of capitalization/trailing spaces
+
+    Examples:
+        >>> m = Matcher(["Dog ", "rat"], exact=False)
+        >>> m.find(["dog", "cat", "RAT"])
+        ['dog', 'RAT']
+
+        >>> m.mask(pd.Series(["dog", "cat"]))
+        0     True
+        1    False
+        dtype: bool
+
+        >>> "rat" in m
+        True
+    """
+
+    def __init__(self, checklist, exact=True):
+        if isinstance(checklist, str):
+            checklist = [i.strip() for i in checklist.split(",")]
+        self.exact = exact
+        if exact:
+            self._keys = dict.fromkeys(checklist)
+        else:
+            self._keys = dict.fromkeys(self._norm(i) for i in checklist)
+        self._index = None
+
+    @staticmethod
+    def _norm(item):
+        return str(item).lower().strip()
+
+    def _lookup_index(self):
+        # built lazily; pandas caches the hash table so batch lookups reuse it
+        if self._index is None:
+            # distinct NaN objects are separate dict keys but one Index value
+            self._index = pd.Index(list(self._keys), dtype=object).unique()
+        return self._index
+
+    def __contains__(self, item):
+        if self.exact:
+            try:
+                return item in self._keys
+            except TypeError:
+                return False
+        else:
+            return self._norm(item) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"Matcher({len(self._keys)} items, exact={self.exact})"
+
+    def mask(self, ref):
+        """
+        Checks which items of `ref` are in the checklist.
+
+        Args:
+            ref (list, np.ndarray, pd.Series): Items to check
+
+        Returns:
+            np.ndarray|pd.Series: Booleans lined up with `ref` (a Series if a Series was passed)
+        """
+        if isinstance(ref, pd.Series):
+            vals = ref.astype(str).str.lower().str.strip() if not self.exact else ref
+            out = self._lookup_index().get_indexer(vals.to_numpy(dtype=object)) != -1
+            return pd.Series(out, index=ref.index)
+        if not self.exact:
+            ref = [self._norm(i) for i in ref]
+        return self._lookup_index().get_indexer(np.asarray(ref, dtype=object)) != -1
+
+    def find(self, ref, show_all=True):
+        """
+        Finds the items of `ref` that are in the checklist (nothing is printed when there are no matches).
+
+        Args:
+            ref (list, np.ndarray, pd.Series): Items to check
+            show_all (bool): If False only the first matching item is returned, otherwise everything is
+
+        Returns:
+            list: Items from ref that exist in the checklist (empty if nothing matches)
+        """
+        if isinstance(ref, str):
+            ref = [ref]
+        if show_all:
+            return [i for i in ref if i in self]
+        for i in ref:
+            if i in self:
+                return [i]
+        return []
+
+
+class FuzzyIndex:
+    """
+    Index for fast fuzzy lookups against a large vocabulary, returning the same matches as
+    `difflib.get_close_matches`. Each entry's character counts are indexed once, so a query gets the
+    `quick_ratio` upper bound for every entry in one vectorized pass and only the entries that can
+    still reach `cutoff` are rescored with `difflib.SequenceMatcher`. Passing `candidates` to the
+    lookups switches to an approximate and faster mode that only rescores that many entries, picked
+    by character n-gram overlap.
+
+    Args:
+        vocab (list, pd.Series): Strings to match against
+        n (int): Size of the character n-grams used by approximate lookups (3 by default)
+        ignore_case (bool): Whether or not to match regardless of capitalization
+
+    Examples:
+        >>> fi = FuzzyIndex(["Acme Corp", "Acme Corporation", "Globex", "Initech"])
+        >>> fi.lookup("acme corp.")
+        ['Acme Corp', 'Acme Corporation']
+
+        >>> fi.lookup_many(["globx", "initech inc"], k=1, scores=True)
+        [[('Globex', 0.9090909090909091)], [('Initech', 0.7777777777777778)]]
+    """
+
+    def __init__(self, vocab, n=3, ignore_case=True):
+        self.vocab = list(dict.fromkeys(vocab))
+        self.n = n
+        self.ignore_case = ignore_case
+        self._keys = [self._norm(i) for i in self.vocab]
+        self._lens = np.array([len(i) for i in self._keys], dtype=np.int64)
+        postings, chars = {}, {}
+        self._sizes = np.empty(len(self._keys), dtype=np.int32)
+        for ix, key in enumerate(self._keys):
+            grams = self._grams(key)
+            self._sizes[ix] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(ix)
+            for c, count in Counter(key).items():
+                ids, counts = chars.setdefault(c, ([], []))
+                ids.append(ix)
+                counts.append(count)
+        self._postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._chars = {
+            c: (np.array(ids, dtype=np.int32), np.array(counts, dtype=np.int32))
+            for c, (ids, counts) in chars.items()
+        }
+
+    def _norm(self, word):
+        word = str(word).strip()
+        return word.lower() if self.ignore_case else word
+
+    def _grams(self, key):
+        padded = f"{' ' * (self.n - 1)}{key} "
+        return {padded[i: i + self.n] for i in range(len(padded) - self.n + 1)}
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def __repr__(self):
+        return f"FuzzyIndex({len(self.vocab)} entries, n={self.n})"
+
+    def _bounded(self, key, cutoff):
+        # quick_ratio (shared character counts) is an upper bound of ratio, same as difflib uses
+        shared = np.zeros(len(self._keys), dtype=np.int64)
+        for c, count in Counter(key).items():
+            if c in self._chars:
+                ids, counts = self._chars[c]
+                shared[ids] += np.minimum(counts, count)
+        total = len(key) + self._lens
+        with np.errstate(divide="ignore", invalid="ignore"):
+            quick = np.where(total > 0, 2.0 * shared / total, 1.0)
+        return np.flatnonzero(quick >= cutoff)
+
+    def _approx(self, key, candidates):
+        grams = self._grams(key)
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if not hits:
+            return np.empty(0, dtype=np.int32)
+        ids, shared = np.unique(np.concatenate(hits), return_counts=True)
+        # dice coefficient on n-gram sets picks the candidates worth rescoring
+        dice = 2 * shared / (len(grams) + self._sizes[ids])
+        if len(ids) > candidates:
+            ids = ids[np.argpartition(-dice, candidates)[:candidates]]
+        return ids
+
+    def lookup(self, query, k=3, cutoff=0.6, scores=False, candidates=None):
+        """
+        Finds the closest vocabulary entries to a query.
+
+        Args:
+            query (str): String to look up
+            k (int): Maximum number of matches to return
+            cutoff (float): Minimum similarity score (0-1) a match needs
+            scores (bool): If `True` (match, score) tuples are returned instead of just matches
+            candidates (int): If given only this many entries (the ones sharing the most character
+                n-grams with the query) are rescored, which is faster but can miss matches
+
+        Returns:
+            list: Best matches (best first)
+        """
+        key = self._norm(query)
+        if candidates is None:
+            ids = self._bounded(key, cutoff)
+        else:
+            ids = self._approx(key, candidates)
+
+        sm = difflib.SequenceMatcher()
+        sm.set_seq2(key)
+        found = []
+        for ix in ids.tolist():
+            sm.set_seq1(self._keys[ix])
+            if (
+                sm.real_quick_ratio() >= cutoff
+                and sm.quick_ratio() >= cutoff
+                and sm.ratio() >= cutoff
+            ):
+                found.append((sm.ratio(), self._keys[ix], ix))
+        # ties broken like get_close_matches (by the larger string)
+        found = heapq.nlargest(k, found)
+        if scores:
+            return [(self.vocab[ix], score) for score, _, ix in found]
+        else:
+            return [self.vocab[ix] for _, _, ix in found]
+
+    def lookup_many(self, queries, k=3, cutoff=0.6, scores=False, workers=None, candidates=None):
+        """
+        Batch version of `lookup`, optionally spread across a process pool.
+
+        Args:
+            queries (list, pd.Series): Strings to look up
+            k (int): Maximum number of matches to return per query
+            cutoff (float): Minimum similarity score (0-1) a match needs
+            scores (bool): If `True` (match, score) tuples are returned instead of just matches
+            workers (int): Number of worker processes (`None` or 1 runs in the current process)
+            candidates (int): Approximate mode pool size (see `lookup`)
+
+        Returns:
+            list: One list of matches per query (lined up with `queries`)
+        """
+        queries = list(queries)
+        func = partial(_fuzzy_lookup, k=k, cutoff=cutoff, scores=scores, candidates=candidates)
+        if not workers or workers <= 1 or len(queries) < 2:
+            return [func(q, index=self) for q in queries]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_fuzzy_init, initargs=(self,)
+        ) as executor:
+            chunksize = max(1, len(queries) // (workers * 4))
+            return list(executor.map(func, queries, chunksize=chunksize))
+
+
+_FUZZY_INDEX = None
+
+
+def _fuzzy_init(index):
+    # runs once per worker process so the index is only pickled once per worker
+    global _FUZZY_INDEX
+    _FUZZY_INDEX = index
+
+
+def _fuzzy_lookup(query, k, cutoff, scores, candidates, index=None):
+    index = _FUZZY_INDEX if index is None else index
+    return index.lookup(query, k=k, cutoff=cutoff, scores=scores, candidates=candidates)
+
+
+def _iter_batches(data, batch_size=100000):
+    """
+    Yields Series/DataFrame batches from a Series, DataFrame, list/array or an iterable of values
+    and/or Series/DataFrame chunks (i.e. `pd.read_csv(..., chunksize=...)`).
+    """
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        yield data
+    elif isinstance(data, (list, tuple, np.ndarray)):
+        yield pd.Series(data)
+    else:
+        batch = []
+        for item in data:
+            if isinstance(item, (pd.Series, pd.DataFrame)):
+                yield item
+            else:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield pd.Series(batch)
+                    batch = []
+        if batch:
+            yield pd.Series(batch)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch for approximate distinct counts in a small, fixed amount of memory
+    (`2 ** precision` bytes). Values are hashed with `pd.util.hash_pandas_object` (a fixed hash key,
+    so sketches built in different processes can be merged) and sketches pickle cleanly, so they can
+    be saved with `save_obj`. Note values are hashed per dtype, e.g. the int `1` and string `"1"`
+    count as different values.
+
+    Args:
+        precision (int): Number of index bits (4-18); the typical error is `1.04 / sqrt(2 ** precision)`,
+            ~0.8% at the default of 14
+
+    Examples:
+        >>> hll = HyperLogLog()
+        >>> hll.update(df["user_id"])
+        >>> for chunk in pd.read_csv("events.csv", chunksize=100000):
+        ...     hll.update(chunk["user_id"])
+        >>> hll.count()
+        1048213
+
+        >>> merged = HyperLogLog().merge(sketch1, sketch2)
+    """
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    @property
+    def error(self):
+        """Typical relative error of the estimate."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def _add_hashes(self, hashes):
+        p = np.uint64(self.precision)
+        idx = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        # rank = position of the first set bit after the index bits (capped by a sentinel bit)
+        w = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        hi = (w >> np.uint64(32)).astype(np.float64)
+        lo = (w & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(hi > 0, 32 + np.frexp(hi)[1], np.frexp(lo)[1])
+        np.maximum.at(self.registers, idx, (65 - bit_length).astype(np.uint8))
+
+    def add(self, value):
+        """
+        Adds a single value to the sketch.
+
+        Args:
+            value (any type): Value to add
+        """
+        self.update([value])
+
+    def update(self, data, batch_size=100000):
+        """
+        Adds many values to the sketch.
+
+        Args:
+            data (pd.Series, pd.DataFrame, list, np.ndarray, iterable): Values to add; DataFrames count
+                distinct rows and iterables may yield values or Series/DataFrame chunks
+            batch_size (int): Number of loose values hashed at a time when consuming an iterable
+
+        Returns:
+            HyperLogLog: The sketch itself (so calls can be chained)
+        """
+        for batch in _iter_batches(data, batch_size):
+            if len(batch):
+                self._add_hashes(pd.util.hash_pandas_object(batch, index=False).to_numpy())
+        return self
+
+    def merge(self, *others):
+        """
+        Merges other sketches (i.e. built by parallel workers) into this one.
+
+        Args:
+            others (HyperLogLog): Sketches built with the same precision
+
+        Returns:
+            HyperLogLog: The sketch itself, now counting the values of every merged sketch
+        """
+        for other in others:
+            if other.precision != self.precision:
+                raise ValueError("Can't merge sketches with different precisions")
+            np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """
+        Estimates the number of distinct values added so far.
+
+        Returns:
+            int: Estimated distinct count
+        """
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # small range correction
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+    def __repr__(self):
+        return f"HyperLogLog(precision={self.precision}, count~{self.count():,})"
+
+
+class TopK:
+    """
+    Bounded-memory heavy hitter counter (Space-Saving algorithm). At most `capacity` values are
+    tracked; when a new value shows up and the counter is full it replaces the value with the lowest
+    count and inherits that count as its possible overestimate. Every reported count is an upper
+    bound and `count - error` is a lower bound of the true count, and any value that occurs more than
+    `total / capacity` times is guaranteed to be tracked.
+
+    Args:
+        k (int): Number of values `most_common` reports by default
+        capacity (int): Number of values tracked (more = more accurate, `max(10 * k, 100)` by default)
+
+    Examples:
+        >>> tk = TopK(k=3)
+        >>> for chunk in pd.read_csv("events.csv", chunksize=100000):
+        ...     tk.update(chunk["page"])
+        >>> tk.most_common()
+        [('/home', 51234, 0), ('/search', 20110, 0), ('/cart', 9876, 12)]
+    """
+
+    def __init__(self, k=10, capacity=None):
+        self.k = k
+        self.capacity = capacity or max(10 * k, 100)
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+        self._heap = []
+        self._seq = 0
+
+    def _push(self, value):
+        self._seq += 1
+        heapq.heappush(self._heap, (self.counts[value], self._seq, value))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(c, i, v) for i, (v, c) in enumerate(self.counts.items())]
+        self._seq = len(self._heap)
+        heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        # heap entries go stale whenever a count changes, skip those
+        while True:
+            count, _, value = heapq.heappop(self._heap)
+            if self.counts.get(value) == count:
+                return value, count
+
+    def add(self, value, count=1):
+        """
+        Counts a single value.
+
+        Args:
+            value (any type): Value to count (must be hashable)
+            count (int): Number of occurrences to add
+        """
+        self.total += count
+        if value in self.counts:
+            self.counts[value] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[value] = count
+            self.errors[value] = 0
+        else:
+            evicted, floor = self._pop_min()
+            del self.counts[evicted], self.errors[evicted]
+            self.counts[value] = floor + count
+            self.errors[value] = floor
+        self._push(value)
+
+    def update(self, data, batch_size=100000):
+        """
+        Counts many values. Each batch is pre-aggregated with `value_counts` first, so only one update
+        per distinct value in the batch is needed. Nulls are skipped.
+
+        Args:
+            data (pd.Series, pd.DataFrame, list, np.ndarray, iterable): Values to count; DataFrames count
+                rows and iterables may yield values or Series/DataFrame chunks
+            batch_size (int): Number of loose values aggregated at a time when consuming an iterable
+
+        Returns:
+            TopK: The counter itself (so calls can be chained)
+        """
+        for batch in _iter_batches(data, batch_size):
+            vc = batch.value_counts()
+            for value, count in zip(vc.index.tolist(), vc.tolist()):
+                self.add(value, count)
+        return self
+
+    def _floor(self):
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def merge(self, *others):
+        """
+        Merges other counters (i.e. built by parallel workers) into this one.
+
+        Args:
+            others (TopK): Counters to merge
+
+        Returns:
+            TopK: The counter itself, now counting the values of every merged counter
+        """
+        for other in others:
+            floor1, floor2 = self._floor(), other._floor()
+            values = set(self.counts) | set(other.counts)
+            counts = {
+                v: self.counts.get(v, floor1) + other.counts.get(v, floor2) for v in values
+            }
+            top = heapq.nlargest(self.capacity, counts, key=counts.get)
+            self.errors = {
+                v: self.errors.get(v, floor1) + other.errors.get(v, floor2) for v in top
+            }
+            self.counts = {v: counts[v] for v in top}
+            self.total += other.total
+            self._rebuild()
+        return self
+
+    def most_common(self, n=None):
+        """
+        Lists the most common values seen so far.
+
+        Args:
+            n (int): Number of values to return (`k` by default)
+
+        Returns:
+            list: `(value, estimated count, max overestimate)` tuples, most common first
+        """
+        top = heapq.nlargest(n or self.k, self.counts.items(), key=lambda x: x[1])
+        return [(v, c, self.errors[v]) for v, c in top]
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __repr__(self):
+        return f"TopK(k={self.k}, capacity={self.capacity}, total={self.total:,})"
+
+
+_ATOMIC = (str, bytes, bytearray, int, float, complex, bool, type(None), range, date, datetime)
+
+
+def _memsize(obj, seen, sample):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    if isinstance(obj, pd.Index):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        size = sys.getsizeof(obj)
+        if obj.base is not None:
+            size += _memsize(obj.base, seen, sample)  # views share the buffer of their base
+        if obj.dtype == object:
+            size += _sampled(obj.ravel().tolist(), seen, sample)
+        return size
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _ATOMIC):
+        return size
+    if isinstance(obj, dict):
+        return size + _sampled(obj.items(), seen, sample, pairs=True)
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + _sampled(obj, seen, sample)
+    if hasattr(obj, "__dict__"):
+        size += _memsize(vars(obj), seen, sample)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if slot != "__dict__" and hasattr(obj, slot):
+            size += _memsize(getattr(obj, slot), seen, sample)
+    return size
+
+
+def _sampled(items, seen, sample, pairs=False, start=0):
+    """Sizes the items of a container, extrapolating from an evenly spread sample of large ones."""
+    n = len(items) - start
+    step = max(n // sample, 1) if sample else 1
+    picked = list(islice(items, start, None, step))
+    objs = [obj for item in picked for obj in item] if pairs else picked
+    if step == 1:
+        return sum(_memsize(obj, seen, sample) for obj in objs)
+
+    # objects showing up more than once in the sample are most likely shared by the whole container,
+    # so only their one-time cost is counted; the rest is extrapolated to the unsampled items
+    repeats = Counter(map(id, objs))
+    fixed = scaled = 0
+    for obj in objs:
+        size = _memsize(obj, seen, sample)
+        if repeats[id(obj)] > 1:
+            fixed += size
+        else:
+            scaled += size
+    return int(fixed + scaled * n / len(picked))
+
+
+def memsize(obj, breakdown=False, sample=1000):
+    """
+    Measures the deep memory footprint of an object in bytes: containers, dicts and object attributes
+    are walked recursively, DataFrames/Series use `memory_usage(deep=True)` and numpy arrays their
+    buffer size. Objects referenced more than once are only counted once. Containers with more than
+    `sample` items are measured on an evenly spread sample and extrapolated, so measuring a huge
+    object stays cheap (the result is then an estimate).
+
+    Args:
+        obj (any type): Object to measure
+        breakdown (bool): If `True` also returns the size of each component (DataFrame columns, dict
+            keys, list items or object attributes)
+        sample (int): Maximum number of items measured per container, `None` measures everything
+
+    Returns:
+        int: Size in bytes (`(size, {component: bytes})` if `breakdown` is `True`)
+
+    Examples:
+        >>> memsize({"ids": list(range(1000)), "name": "users"})
+        36399
+
+        >>> memsize(df, breakdown=True)
+        (522, {'Index': 132, 'animal': 180, 'name': 186, 'age': 24})
+    """
+    seen = set()
+    if not breakdown:
+        return _memsize(obj, seen, sample)
+
+    if isinstance(obj, pd.DataFrame):
+        parts = obj.memory_usage(deep=True)
+        parts = {str(k): int(v) for k, v in parts.items()}
+        return sum(parts.values()), parts
+
+    seen.add(id(obj))
+    parts = {"(container)": sys.getsizeof(obj)}
+    if isinstance(obj, dict):
+        items = [(str(k), (k, v)) for k, v in islice(obj.items(), sample)]
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        items = [(f"[{i}]", v) for i, v in enumerate(islice(obj, sample))]
+    elif hasattr(obj, "__dict__") or hasattr(type(obj), "__slots__"):
+        attrs = dict(vars(obj)) if hasattr(obj, "__dict__") else {}
+        for slot in getattr(type(obj), "__slots__", ()):
+            if slot != "__dict__" and hasattr(obj, slot):
+                attrs[slot] = getattr(obj, slot)
+        if hasattr(obj, "__dict__"):
+            parts["(container)"] += sys.getsizeof(vars(obj))
+            seen.add(id(vars(obj)))
+        items = list(attrs.items())
+    else:
+        size = _memsize(obj, set(), sample)
+        return size, {type(obj).__name__: size}
+
+    for name, item in items:
+        if isinstance(obj, dict):
+            parts[name] = _memsize(item[0], seen, sample) + _memsize(item[1], seen, sample)
+        else:
+            parts[name] = _memsize(item, seen, sample)
+    rest = len(obj) - len(items) if isinstance(obj, (dict, list, tuple, set, frozenset, deque)) else 0
+    if rest > 0:
+        parts[f"(other {rest:,} items, est.)"] = _sampled(
+            obj.items() if isinstance(obj, dict) else obj, seen, sample,
+            pairs=isinstance(obj, dict), start=len(items),
+        )
+    return sum(parts.values()), parts
+
+
 def is_empty(obj):
     """
     Checks if a given obj is either null, blank or `len(obj) == 0`.
@@ -837,6 +1730,167 @@ def reverse_dict(mydict, vals_as_list=False):
     return reversed_dict
 
 
+_MISSING = object()
+
+
+class _BiDictInverse(Mapping):
+    __slots__ = ("_bidict",)
+
+    def __init__(self, bidict):
+        self._bidict = bidict
+
+    def __getitem__(self, val):
+        keys = self._bidict._inv[val]
+        if isinstance(keys, dict):
+            return list(keys)
+        return [keys] if self._bidict.vals_as_list else keys
+
+    def __iter__(self):
+        return iter(self._bidict._inv)
+
+    def __len__(self):
+        return len(self._bidict._inv)
+
+    def __contains__(self, val):
+        return val in self._bidict._inv
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())})"
+
+
+class BiDict(MutableMapping):
+    """
+    Dictionary that keeps its inverse (value -> key) in sync on every insert and delete, so both
+    directions are always a single lookup away instead of rebuilding them with `reverse_dict`. Like
+    `reverse_dict`, values shared by several keys map back to a list of those keys.
+
+    Args:
+        data (dict, iterable): Initial `{key: value}` items
+        vals_as_list (bool): If `True` the inverse always returns lists, not just for shared values
+
+    Examples:
+        >>> bd = BiDict({"dog": "cat", "ferret": "rat"})
+        >>> bd["lion"] = "cat"
+        >>> bd.inverse["cat"]
+        ['dog', 'lion']
+        >>> del bd["dog"]
+        >>> bd.inverse["cat"]
+        'lion'
+
+        >>> ids = BiDict.from_df(df, "user_id", "account_id")
+    """
+
+    __slots__ = ("_fwd", "_inv", "vals_as_list")
+
+    def __init__(self, data=None, vals_as_list=False, **kwargs):
+        self._fwd = {}
+        self._inv = {}  # value -> key, or an insertion ordered {key: None} for shared values
+        self.vals_as_list = vals_as_list
+        self.update(data or {}, **kwargs)
+
+    @classmethod
+    def from_df(cls, df, key_col, val_col, vals_as_list=False):
+        """
+        Builds a `BiDict` from two DataFrame columns in bulk (later duplicate keys win).
+
+        Args:
+            df (pd.DataFrame): DataFrame to reference
+            key_col (str): Column with the keys
+            val_col (str): Column with the values
+            vals_as_list (bool): If `True` the inverse always returns lists
+
+        Returns:
+            BiDict: The `{key: value}` mapping and its inverse
+        """
+        bd = cls(vals_as_list=vals_as_list)
+        bd._fwd = dict(zip(df[key_col].tolist(), df[val_col].tolist()))
+        keys, vals = list(bd._fwd), list(bd._fwd.values())
+        bd._inv = dict(zip(vals, keys))
+        if len(bd._inv) < len(keys):
+            # only values shared by several keys need grouping, done group by group rather than row
+            # by row by sorting their rows by value
+            col = df[val_col] if len(keys) == len(df) else pd.Series(vals, dtype=object)
+            codes = pd.factorize(col)[0]
+            nulls = np.flatnonzero(codes < 0).tolist()
+            codes[codes < 0] = codes.max() + 1 + np.arange(len(nulls))  # never grouped
+            shared = np.flatnonzero(np.bincount(codes)[codes] > 1)
+            shared = shared[np.argsort(codes[shared], kind="stable")]
+            bounds = np.flatnonzero(np.diff(codes[shared])) + 1
+            shared_keys = np.array(keys, dtype=object)[shared].tolist()
+            starts = [0] + bounds.tolist()
+            ends = bounds.tolist() + [len(shared)]
+            for start, end in zip(starts, ends):
+                bd._inv[vals[shared[start]]] = dict.fromkeys(shared_keys[start:end])
+            # nulls are linked one by one, like __setitem__ does (NaN != NaN, so only the same
+            # NaN object is shared)
+            for i in nulls:
+                bd._inv.pop(vals[i], None)
+            for i in nulls:
+                bd._link(keys[i], vals[i])
+        return bd
+
+    @property
+    def inverse(self):
+        """Read-only, always current `{value: key(s)}` view."""
+        return _BiDictInverse(self)
+
+    def _link(self, key, val):
+        keys = self._inv.get(val, _MISSING)
+        if keys is _MISSING:
+            self._inv[val] = key
+        elif isinstance(keys, dict):
+            keys[key] = None
+        else:
+            self._inv[val] = {keys: None, key: None}
+
+    def _unlink(self, key, val):
+        keys = self._inv[val]
+        if isinstance(keys, dict):
+            del keys[key]
+            if len(keys) == 1:
+                self._inv[val] = next(iter(keys))
+        else:
+            del self._inv[val]
+
+    def __getitem__(self, key):
+        return self._fwd[key]
+
+    def __setitem__(self, key, val):
+        old = self._fwd.get(key, _MISSING)
+        if old is not _MISSING:
+            if old is val:
+                return
+            if old == val:
+                # equal values (i.e. 1 and True) share the inverse entry, only the stored value changes
+                self._fwd[key] = val
+                return
+            self._unlink(key, old)
+        self._fwd[key] = val
+        self._link(key, val)
+
+    def __delitem__(self, key):
+        val = self._fwd.pop(key)
+        self._unlink(key, val)
+
+    def __iter__(self):
+        return iter(self._fwd)
+
+    def __len__(self):
+        return len(self._fwd)
+
+    def __contains__(self, key):
+        return key in self._fwd
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._fwd})"
+
+    def copy(self):
+        bd = type(self)(vals_as_list=self.vals_as_list)
+        bd._fwd = self._fwd.copy()
+        bd._inv = {v: k.copy() if isinstance(k, dict) else k for v, k in self._inv.items()}
+        return bd
+
+
 def keepkeys(mydict, keys):
     """
     Creates a dictionary from the passed dictionary containing only the given keys.
@@ -861,6 +1915,160 @@ def keepkeys(mydict, keys):
     return {k: v for k, v in mydict.items() if k in keys}
 
 
+def _ordered_unique(data):
+    """
+    Dedupes a list-like while keeping the order items first appear in. Large numeric/datetime
+    arrays and Series (and categorical Series of any size) are deduped with NumPy, datetime and
+    timedelta data with pandas (so values stay Timestamp/Timedelta objects).
+
+    Args:
+        data (list, tuple, str, pd.Series, np.ndarray): Items to dedupe (strings are split on commas)
+
+    Returns:
+        list|np.ndarray: Unique items (an array when the NumPy path was taken)
+    """
+    if isinstance(data, str):
+        data = [t.strip() for t in data.split(",")]
+    if isinstance(data, np.ndarray) and data.dtype.kind in "mM":
+        data = pd.Series(data)
+    if isinstance(data, pd.Series):
+        if isinstance(data.dtype, pd.CategoricalDtype):
+            codes = data.cat.codes.to_numpy()
+            codes = codes[codes >= 0]
+            u, idx = np.unique(codes, return_index=True)
+            return list(data.cat.categories[u[np.argsort(idx)]])
+        if data.dtype.kind in "mM":
+            # keep pandas' Timestamp/Timedelta boxing (NumPy would give datetime objects and drop ns)
+            return list(data.unique())
+        data = data.to_numpy()
+    if isinstance(data, np.ndarray) and data.dtype.kind in "biufmM" and len(data) >= 10000:
+        u, idx = np.unique(data, return_index=True)
+        return u[np.argsort(idx)]
+    if isinstance(data, np.ndarray):
+        data = data.tolist()
+    return list(dict.fromkeys(data))
+
+
+def _set_op(lists, op, as_list):
+    uniques = [_ordered_unique(i) for i in lists]
+    if all(isinstance(u, np.ndarray) for u in uniques):
+        first = uniques[0]
+        if op == "intersect":
+            mask = np.ones(len(first), dtype=bool)
+            for other in uniques[1:]:
+                mask &= np.isin(first, other)
+            out = first[mask]
+        elif op == "difference":
+            mask = np.ones(len(first), dtype=bool)
+            for other in uniques[1:]:
+                mask &= ~np.isin(first, other)
+            out = first[mask]
+        else:
+            u, idx, counts = np.unique(
+                np.concatenate(uniques), return_index=True, return_counts=True
+            )
+            if op == "sym_difference":
+                keep = counts % 2 == 1
+                u, idx = u[keep], idx[keep]
+            out = u[np.argsort(idx)]
+        return out.tolist() if as_list else out
+
+    uniques = [u.tolist() if isinstance(u, np.ndarray) else u for u in uniques]
+    first = uniques[0]
+    if op == "intersect":
+        others = [set(u) for u in uniques[1:]]
+        out = [i for i in first if all(i in o for o in others)]
+    elif op == "difference":
+        others = set().union(*uniques[1:])
+        out = [i for i in first if i not in others]
+    elif op == "union":
+        out = list(dict.fromkeys(i for u in uniques for i in u))
+    else:
+        counts = {}
+        for u in uniques:
+            for i in u:
+                counts[i] = counts.get(i, 0) + 1
+        out = [i for i, n in counts.items() if n % 2 == 1]
+    return out if as_list else np.array(out, dtype=object)
+
+
+def intersect(*lists, as_list=True):
+    """
+    Finds the items that appear in every passed list, in the order they appear in the first list.
+    Runs in linear time (large numeric inputs are handled with NumPy).
+
+    Args:
+        lists (list, pd.Series, np.ndarray, str): Any number of lists to compare
+        as_list (bool): If `False` a NumPy array is returned instead of a list
+
+    Returns:
+        list: Unique items that appear in all of the passed lists
+
+    Example:
+        >>> intersect(["dog", "cat", "ferret", "dog"], ["ferret", "dog"], ["dog", "ferret", "bird"])
+        ['dog', 'ferret']
+    """
+    return _set_op(lists, "intersect", as_list)
+
+
+def difference(*lists, as_list=True):
+    """
+    Finds the items of the first list that don't appear in any of the other lists (order kept).
+    Runs in linear time (large numeric inputs are handled with NumPy).
+
+    Args:
+        lists (list, pd.Series, np.ndarray, str): Any number of lists to compare
+        as_list (bool): If `False` a NumPy array is returned instead of a list
+
+    Returns:
+        list: Unique items of the first list missing from the rest
+
+    Example:
+        >>> difference(["dog", "cat", "ferret", "bird"], ["dog"], ["ferret", "horse"])
+        ['cat', 'bird']
+    """
+    return _set_op(lists, "difference", as_list)
+
+
+def union(*lists, as_list=True):
+    """
+    Combines the unique items of all passed lists in the order they first appear.
+    Runs in linear time (large numeric inputs are handled with NumPy).
+
+    Args:
+        lists (list, pd.Series, np.ndarray, str): Any number of lists to combine
+        as_list (bool): If `False` a NumPy array is returned instead of a list
+
+    Returns:
+        list: Unique items across all of the passed lists
+
+    Example:
+        >>> union(["dog", "cat"], ["cat", "bird"], ["dog", "horse"])
+        ['dog', 'cat', 'bird', 'horse']
+    """
+    return _set_op(lists, "union", as_list)
+
+
+def sym_difference(*lists, as_list=True):
+    """
+    Finds the items that appear in an odd number of the passed lists (for two lists this is the
+    items that appear in only one of them), in the order they first appear.
+    Runs in linear time (large numeric inputs are handled with NumPy).
+
+    Args:
+        lists (list, pd.Series, np.ndarray, str): Any number of lists to compare
+        as_list (bool): If `False` a NumPy array is returned instead of a list
+
+    Returns:
+        list: Unique items that appear in an odd number of the passed lists
+
+    Example:
+        >>> sym_difference(["dog", "cat", "bird"], ["cat", "horse"])
+        ['dog', 'bird', 'horse']
+    """
+    return _set_op(lists, "sym_difference", as_list)
+
+
 def find_common(list1, list2):
     """
     Finds common values between two lists.
@@ -876,19 +2084,8 @@ def find_common(list1, list2):
         >>> find_common(["dog", "cat", "ferret", "bird"], ["dog", "ferret", "horse"])
         ['dog', 'ferret']
     """
-    if isinstance(list1, pd.Series):
-        list1 = list(list1)
-    if isinstance(list1, str):
-        list1 = [t.strip() for t in list1.split(",")]
-
-    if isinstance(list2, pd.Series):
-        list2 = list(list2)
-    if isinstance(list2, str):
-        list2 = [t.strip() for t in list2.split(",")]
-
-    items = set(list1) & set(list2)
-    # keep original order of list1
-    return sorted(items, key=lambda x: list1.index(x))
+    # keeps original order of list1
+    return intersect(list1, list2)
 
 
 def find_uncommon(list1, list2):
@@ -906,19 +2103,8 @@ def find_uncommon(list1, list2):
         >>> find_uncommon(["dog", "cat", "ferret", "bird"], ["dog", "ferret", "horse"])
         ['cat', 'bird']
     """
-    if isinstance(list1, pd.Series):
-        list1 = list(list1)
-    if isinstance(list1, str):
-        list1 = [t.strip() for t in list1.split(",")]
-
-    if isinstance(list2, pd.Series):
-        list2 = list(list2)
-    if isinstance(list2, str):
-        list2 = [t.strip() for t in list2.split(",")]
-
-    items = set(list1) - set(list2)
-    # keep original order of list1
-    return sorted(items, key=lambda x: list1.index(x))
+    # keeps original order of list1
+    return difference(list1, list2)
 
 
 def comma_and(input_list, sep=", ", last_sep="and"):
@@ -975,37 +2161,300 @@ def quotify(input_list, single=True):
         return ", ".join([f'"{i}"' for i in input_list])
 
 
-def chunkify(input_list, num):
+def _iter_chunks(input_list, num):
+    if num < 1:
+        raise ValueError("num must be a positive integer")
+    if isinstance(input_list, (pd.DataFrame, pd.Series)):
+        for i in range(0, len(input_list), num):
+            yield input_list.iloc[i: i + num]
+    elif isinstance(input_list, (list, tuple, str, bytes, range, np.ndarray, memoryview)):
+        # slices of arrays/memoryviews are zero-copy views
+        for i in range(0, len(input_list), num):
+            yield input_list[i: i + num]
+    else:
+        it = iter(input_list)
+        while True:
+            chunk = list(islice(it, num))
+            if not chunk:
+                return
+            yield chunk
+
+
+def chunkify(input_list, num, lazy=False):
     """
-    Divides a list into a given number of chunks.
+    Divides a list into a given number of chunks. Any iterable works (generators, file objects,
+    etc.); NumPy arrays and memoryviews are chunked into zero-copy views and DataFrames/Series
+    into row slices.
 
     Args:
-        input_list (list): A list to divide
+        input_list (list, np.ndarray, pd.DataFrame, iterable): A list to divide
         num (int): The number of items each chunk should contain
+        lazy (bool): If `True` a generator is returned so chunks are only built as they're consumed
+            (the input isn't materialized, keeping memory bounded)
 
     Returns:
-        list: A list of lists where each list contains the passed number of items from the given list
+        list|generator: A list (or generator) of lists where each list contains the passed number of items
+        from the given list
 
-    Example:
+    Examples:
         >>> chunkify(["dog", "cat", "ferret", "bird"], num=2)
         [["dog, "cat"], ["ferret", "bird"]]
+
+        >>> with open("big.csv") as f:
+        ...     for lines in chunkify(f, num=1000, lazy=True):
+        ...         send(lines)
     """
-    return [input_list[i: i + num] for i in range(0, len(input_list), num)]
+    chunks = _iter_chunks(input_list, num)
+    if lazy:
+        return chunks
+    else:
+        return list(chunks)
+
 
+def _pmap_chunk(func, start, chunk):
+    # module level so it can be pickled to worker processes; errors are returned (not raised) so the
+    # caller knows exactly which item failed
+    if isinstance(chunk, pd.DataFrame):
+        chunk = (row for _, row in chunk.iterrows())  # rows, not column names
+    out = []
+    for i, item in enumerate(chunk, start):
+        try:
+            out.append(func(item))
+        except Exception as e:
+            return None, (i, repr(item)[:200], e, traceback.format_exc())
+    return out, None
 
-def split_data(data, ratio):
+
+def pmap(func, items, backend="thread", workers=None, chunk_size=None, max_in_flight=None,
+         progress=False, interval=1.0):
     """
-    Splits data into two chunks based on a given ratio.
+    Applies a function to every item in parallel (in chunks) and returns the results in order.
 
     Args:
-        data (list): The data to be split
+        func (function): Function to apply to each item (must be picklable for `backend="process"`)
+        items (list, np.ndarray, pd.Series, pd.DataFrame, iterable): Items to process (see
+            `chunkify`), DataFrames are processed row by row (each row passed as a Series)
+        backend (str): `thread` (I/O bound work) or `process` (CPU bound work)
+        workers (int): Number of workers (defaults to the CPU count)
+        chunk_size (int): Items per task (by default sized so each worker gets ~4 chunks, or 64 when
+            the number of items is unknown)
+        max_in_flight (int): Maximum number of chunks submitted but not yet collected, which keeps
+            memory bounded when consuming generators (2 per worker by default)
+        progress (bool): If `True` progress is printed, at most once every `interval` seconds
+        interval (float): Minimum number of seconds between progress prints
+
+    Returns:
+        list: `func(item)` for every item, in the same order as `items`
+
+    Raises:
+        RuntimeError: If `func` fails on an item (the original exception is chained)
+
+    Example:
+        >>> pmap(requests.get, urls, workers=16, progress=True)
+    """
+    if backend not in ("thread", "process"):
+        raise ValueError("backend must be 'thread' or 'process'")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    try:
+        total = len(items)
+    except TypeError:
+        total = None
+    if chunk_size is None:
+        chunk_size = max(1, -(-total // (workers * 4))) if total else 64
+    if max_in_flight is None:
+        max_in_flight = workers * 2
+
+    name = getattr(func, "__name__", repr(func))
+    results = []
+    pending = deque()
+    started = last_print = time.monotonic()
+
+    def collect():
+        nonlocal last_print
+        start, future = pending.popleft()
+        try:
+            out, err = future.result()
+        except Exception as e:
+            raise RuntimeError(f"pmap: chunk starting at item {start} failed: {e!r}") from e
+        if err is not None:
+            i, item, e, tb = err
+            raise RuntimeError(f"pmap: {name}() failed on item {i} ({item}):\n{tb}") from e
+        results.extend(out)
+        if progress and time.monotonic() - last_print >= interval:
+            last_print = time.monotonic()
+            done = f"{len(results):,}/{total:,}" if total else f"{len(results):,}"
+            gray(f"pmap: {done} items done ({last_print - started:.1f}s)", ts=False)
+
+    executor_cls = ThreadPoolExecutor if backend == "thread" else ProcessPoolExecutor
+    with executor_cls(max_workers=workers) as executor:
+        try:
+            start = 0
+            for chunk in chunkify(items, chunk_size, lazy=True):
+                if len(pending) >= max_in_flight:
+                    collect()
+                pending.append((start, executor.submit(_pmap_chunk, func, start, chunk)))
+                start += len(chunk)
+            while pending:
+                collect()
+        except BaseException:
+            for _, future in pending:
+                future.cancel()
+            raise
+
+    if progress:
+        green(f"pmap: {len(results):,} items done ({time.monotonic() - started:.1f}s)", ts=False)
+    return results
+
+
+def _take(data, idx):
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return data.iloc[idx]
+    elif isinstance(data, np.ndarray):
+        return data[idx]
+    else:
+        return [data[i] for i in idx]
+
+
+def _group_order(data, stratify, rng):
+    """
+    Orders positions so rows of the same stratum sit next to each other (shuffled within each stratum
+    when `rng` is passed).
+
+    Returns:
+        tuple: Ordered positions + the size of each stratum (in order)
+    """
+    if isinstance(stratify, str) and isinstance(data, pd.DataFrame):
+        stratify = data[stratify]
+    codes, _ = pd.factorize(np.asarray(stratify, dtype=object), use_na_sentinel=False)
+    positions = rng.permutation(len(codes)) if rng is not None else np.arange(len(codes))
+    order = positions[np.argsort(codes[positions], kind="stable")]
+    return order, np.bincount(codes)
+
+
+def split_data(data, ratio, shuffle=False, seed=None, stratify=None, indices=False):
+    """
+    Splits data into two chunks based on a given ratio. By default the data is split head/tail
+    (slices, so NumPy arrays and DataFrames aren't copied); the data can also be shuffled and/or
+    stratified, in which case a shuffled index array is split and the rows are taken from it.
+
+    Args:
+        data (list, np.ndarray, pd.Series, pd.DataFrame): The data to be split
         ratio (float): The ratio at which to split the data. Should be between 0 and 1
+        shuffle (bool): If `True` the rows are shuffled before splitting
+        seed (int): Random seed so shuffled splits are reproducible
+        stratify (str, list, pd.Series): Labels (or a DataFrame column name) to stratify by, so each
+            label is split with the same ratio
+        indices (bool): If `True` the positional index arrays of each split are returned instead
+            of the data (nothing is copied)
 
     Returns:
-        tuple: One list containing the first `ratio` proportion of the data, another containing the rest
+        tuple: One chunk containing the first `ratio` proportion of the data, another containing the rest
+
+    Examples:
+        >>> split_data(list(range(10)), 0.8)
+        ([0, 1, 2, 3, 4, 5, 6, 7], [8, 9])
+
+        >>> train, test = split_data(df, 0.8, shuffle=True, seed=42, stratify="animal")
+    """
+    n = len(data)
+    if not shuffle and stratify is None:
+        split_index = int(n * ratio)
+        if indices:
+            return np.arange(split_index), np.arange(split_index, n)
+        elif isinstance(data, (pd.DataFrame, pd.Series)):
+            return data.iloc[:split_index], data.iloc[split_index:]
+        else:
+            return data[:split_index], data[split_index:]
+
+    rng = np.random.default_rng(seed)
+    if stratify is None:
+        perm = rng.permutation(n)
+        split_index = int(n * ratio)
+        first, second = perm[:split_index], perm[split_index:]
+    else:
+        order, sizes = _group_order(data, stratify, rng if shuffle else None)
+        in_first = np.zeros(n, dtype=bool)
+        bounds = np.concatenate([[0], np.cumsum(sizes)])
+        for start, size in zip(bounds[:-1], sizes):
+            in_first[order[start: start + int(round(size * ratio))]] = True
+        first, second = np.flatnonzero(in_first), np.flatnonzero(~in_first)
+        if shuffle:
+            first, second = rng.permutation(first), rng.permutation(second)
+
+    if indices:
+        return first, second
+    else:
+        return _take(data, first), _take(data, second)
+
+
+def kfold(data, k=5, shuffle=True, seed=None, stratify=None, indices=False):
+    """
+    Generates k train/test splits where every row lands in exactly one test fold.
+
+    Args:
+        data (list, np.ndarray, pd.Series, pd.DataFrame): The data to be split
+        k (int): Number of folds
+        shuffle (bool): If `True` rows are shuffled before being assigned to folds
+        seed (int): Random seed so the folds are reproducible
+        stratify (str, list, pd.Series): Labels (or a DataFrame column name) to stratify by, so each
+            fold has roughly the same label proportions
+        indices (bool): If `True` positional index arrays are yielded instead of the data
+
+    Returns:
+        generator: `(train, test)` tuples, one per fold
+
+    Example:
+        >>> for train, test in kfold(df, k=5, seed=42):
+        ...     model.fit(train)
+    """
+    n = len(data)
+    rng = np.random.default_rng(seed) if shuffle else None
+    fold_of = np.empty(n, dtype=np.int64)
+    if stratify is None:
+        order = rng.permutation(n) if shuffle else np.arange(n)
+        fold_of[order] = np.arange(n) * k // n
+    else:
+        # deal each stratum's rows round-robin across the folds
+        order, _ = _group_order(data, stratify, rng)
+        fold_of[order] = np.arange(n) % k
+
+    for fold in range(k):
+        test = np.flatnonzero(fold_of == fold)
+        train = np.flatnonzero(fold_of != fold)
+        if indices:
+            yield train, test
+        else:
+            yield _take(data, train), _take(data, test)
+
+
+def hash_split(key, ratio, seed=0):
     """
-    split_index = int(len(data) * ratio)
-    return data[:split_index], data[split_index:]
+    Deterministically assigns records to a split by hashing their key, so the assignment is the same
+    on every run and can be decided one record at a time (e.g. while streaming a file).
+
+    Args:
+        key (any type, list, pd.Series): Record key (or a list/Series of keys)
+        ratio (float): Proportion of keys that should land in the first split (0 to 1)
+        seed (int, str): Changes the assignment without changing the ratio
+
+    Returns:
+        bool|np.ndarray|pd.Series: `True` when a key belongs to the first split
+
+    Example:
+        >>> [hash_split(i, 0.8) for i in ["user_1", "user_2", "user_3"]]
+        [False, True, True]
+    """
+    def first(k):
+        digest = hashlib.blake2b(f"{seed}:{k}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") < ratio * 2 ** 64
+
+    if isinstance(key, pd.Series):
+        return pd.Series([first(k) for k in key], index=key.index, dtype=bool)
+    elif isinstance(key, (list, np.ndarray)):
+        return np.array([first(k) for k in key], dtype=bool)
+    else:
+        return first(key)
 
 
 def join_newline(items, n):
@@ -1108,9 +2557,244 @@ def dget(dict_obj, key, val=None):
     return dict_obj.get(key, val)
 
 
-def filelist(dirpath, ext=None, prefix=None, raise_err=False, keep_ext=True):
+_PATH_RGX = re.compile(r"""\[\s*(?:(-?\d+)|"([^"]*)"|'([^']*)')\s*\]|\.?([^.\[\]]+)""")
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path):
     """
-    Lists the filenames in the passed directory.
+    Compiles a nested path expression into a getter function with `dget`'s semantics, so paths used
+    on many records are only parsed once. Dots separate keys, `[0]` indexes lists (negative indexes
+    work) and quoted brackets (`["a.b"]`) allow keys containing dots or brackets.
+
+    Args:
+        path (str): Path expression, i.e. `"user.addresses[0].city"`
+
+    Returns:
+        function: `getter(obj, val=None)` returning the value at the path, or `val` if any step is
+            missing or the final value is falsy or a null string (see `dget`)
+
+    Examples:
+        >>> city = compile_path("user.addresses[0].city")
+        >>> city({"user": {"addresses": [{"city": "Boston"}]}})
+        'Boston'
+        >>> city({"user": {"addresses": []}}, "N/A")
+        'N/A'
+    """
+    steps = []
+    pos = 0
+    for m in _PATH_RGX.finditer(path):
+        if m.start() != pos:
+            raise ValueError(f"Invalid path: {path}")
+        pos = m.end()
+        index, dquoted, squoted, key = m.groups()
+        if index is not None:
+            steps.append(int(index))
+        else:
+            steps.append(key if key is not None else dquoted if dquoted is not None else squoted)
+    if not steps or pos != len(path):
+        raise ValueError(f"Invalid path: {path}")
+    steps = tuple(steps)
+
+    def getter(obj, val=None):
+        try:
+            for step in steps:
+                obj = obj[step]
+        except (KeyError, IndexError, TypeError):
+            return val
+        if not obj or (isinstance(obj, str) and obj in NULL_TOKENS):  # same as nullstr for strings
+            return val
+        return obj
+
+    getter.path = path
+    getter.steps = steps
+    return getter
+
+
+def dpath(obj, path, val=None):
+    """
+    Nested version of `dget`: gets the value at a path like `"a.b[0].c"` (see `compile_path`).
+
+    Args:
+        obj (dict, list): Object to reference
+        path (str): Path expression
+        val (any type): Default value to return if the path doesn't exist or its value is null
+
+    Returns:
+        any: Value at the path (or `val`)
+
+    Examples:
+        >>> dpath({"a": {"b": [{"c": 1}]}}, "a.b[0].c")
+        1
+
+        >>> dpath({"a": {"b": [{"c": ""}]}}, "a.b[0].c", val="N/A")
+        'N/A'
+    """
+    return compile_path(path)(obj, val)
+
+
+def dpaths(records, paths, val=None, as_df=True):
+    """
+    Extracts several nested paths from many records (i.e. parsed JSON) in a single pass.
+
+    Args:
+        records (iterable): Records to reference (can be a generator)
+        paths (str, list, dict): Path expressions (comma-separated string, list, or `{column: path}`)
+        val (any type): Default value for missing or null values
+        as_df (bool): If `True` returns a DataFrame, otherwise a dict of lists
+
+    Returns:
+        pd.DataFrame: One column per path (or `{column: [values]}` if `as_df` is `False`)
+
+    Example:
+        >>> records = [
+        ...     {"id": 1, "user": {"name": "Ann", "tags": ["a", "b"]}},
+        ...     {"id": 2, "user": {"name": "", "tags": []}},
+        ... ]
+        >>> dpaths(records, {"id": "id", "name": "user.name", "tag": "user.tags[0]"})
+
+        ```
+        |    |   id | name   | tag   |
+        |----|------|--------|-------|
+        |  0 |    1 | Ann    | a     |
+        |  1 |    2 | nan    | nan   |
+        ```
+    """
+    if isinstance(paths, str):
+        paths = [i.strip() for i in paths.split(",")]
+    if not isinstance(paths, dict):
+        paths = {p: p for p in paths}
+    getters = [compile_path(p) for p in paths.values()]
+    columns = [[] for _ in getters]
+    pairs = list(zip(getters, [col.append for col in columns]))
+    for record in records:
+        for getter, append in pairs:
+            append(getter(record, val))
+    out = dict(zip(paths, columns))
+    return pd.DataFrame(out) if as_df else out
+
+
+def _scan_dir(path, depth, root=False):
+    """Lists a directory's entries (errors below the root directory are skipped)."""
+    try:
+        with os.scandir(path) as it:
+            return list(it), depth
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        if root:
+            raise
+        return [], depth
+
+
+def iterfiles(dirpath, ext=None, prefix=None, glob=None, regex=None, recursive=False, depth=None,
+              min_size=None, max_size=None, modified_after=None, modified_before=None,
+              include_dirs=False, full_path=True, keep_ext=True, workers=None):
+    """
+    Lazily walks a directory with `os.scandir`, yielding the paths of the files matching every given
+    filter. File sizes and modification times are only looked up when a size/time filter is used.
+    Symlinked directories aren't followed.
+
+    Args:
+        dirpath (str): Directory path to reference
+        ext (str, list): Extension(s) of the files to target (list or comma-separated string)
+        prefix (str): Target files that start with this prefix
+        glob (str): Target files whose name matches this glob (i.e. `"sales_*_2024.csv"`)
+        regex (str, re.Pattern): Target files whose name matches this regex (`re.search`)
+        recursive (bool): If `True` subdirectories are walked too
+        depth (int): Maximum subdirectory depth to walk (implies `recursive`, `0` = `dirpath` only)
+        min_size (int): Minimum file size in bytes
+        max_size (int): Maximum file size in bytes
+        modified_after (datetime, float): Only files modified after this datetime/timestamp
+        modified_before (datetime, float): Only files modified before this datetime/timestamp
+        include_dirs (bool): If `True` directories matching the name filters are yielded too
+        full_path (bool): If `False` paths are yielded relative to `dirpath`
+        keep_ext (bool): If `False` filenames are yielded without their extensions
+        workers (int): Scan subdirectories in this many threads (helps on network filesystems),
+            results then come in no particular order
+
+    Returns:
+        generator: Matching file paths
+
+    Examples:
+        >>> list(iterfiles("data", ext="csv,parquet", recursive=True))
+        ['data/users.csv', 'data/2024/orders.parquet']
+
+        >>> for path in iterfiles("/mnt/lake", glob="events_*", min_size=1, depth=2, workers=16):
+        ...     process(path)
+    """
+    if isinstance(ext, str):
+        ext = [i.strip() for i in ext.split(",")]
+    if ext:
+        ext = tuple(i if "." in i else f".{i}" for i in ext)
+    if regex is not None:
+        regex = compile_regex(regex)
+    if depth is None:
+        depth = float("inf") if recursive else 0
+    after, before = [
+        i.timestamp() if isinstance(i, datetime) else i for i in (modified_after, modified_before)
+    ]
+    check_stat = any(i is not None for i in (min_size, max_size, after, before))
+    root = os.fspath(dirpath)
+
+    def match(entry, is_dir):
+        name = entry.name
+        if ext and not name.endswith(ext):
+            return False
+        if prefix and not name.startswith(prefix):
+            return False
+        if glob and not fnmatch.fnmatch(name, glob):
+            return False
+        if regex is not None and not regex.search(name):
+            return False
+        if check_stat and not is_dir:
+            st = entry.stat()
+            if (min_size is not None and st.st_size < min_size) or (
+                max_size is not None and st.st_size > max_size
+            ):
+                return False
+            if (after is not None and st.st_mtime <= after) or (
+                before is not None and st.st_mtime >= before
+            ):
+                return False
+        return True
+
+    def output(entry):
+        path = entry.path if full_path else os.path.relpath(entry.path, root)
+        if not keep_ext:
+            path = os.path.splitext(path)[0]  # leaves dotfiles and dotted directories alone
+        return path
+
+    def handle(entries, level, visit):
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir and level < depth:
+                visit(entry.path, level + 1)
+            if (include_dirs or not is_dir) and match(entry, is_dir):
+                yield output(entry)
+
+    if not workers:
+        queue = deque([_scan_dir(root, 0, root=True)])
+        visit = lambda path, level: queue.append(_scan_dir(path, level))
+        while queue:
+            entries, level = queue.popleft()
+            yield from handle(entries, level, visit)
+        return
+
+    with ThreadPoolExecutor(workers) as executor:
+        pending = {executor.submit(_scan_dir, root, 0, True)}
+        visit = lambda path, level: pending.add(executor.submit(_scan_dir, path, level))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending -= done
+            for future in done:
+                yield from handle(*future.result(), visit)
+
+
+def filelist(dirpath, ext=None, prefix=None, raise_err=False, keep_ext=True, full_path=False):
+    """
+    Lists the filenames in the passed directory (see `iterfiles` for recursive/filtered listings).
 
     Args:
         dirpath (str): Directory path to reference
@@ -1118,39 +2802,20 @@ def filelist(dirpath, ext=None, prefix=None, raise_err=False, keep_ext=True):
         prefix (str): Target files that start with this prefix
         raise_err (bool): If `False` FileNotFoundErrors will fail silently
         keep_ext (bool): If `False` base filenames without their extensions are returned
+        full_path (bool): If `True` full paths are returned instead of filenames
 
     Returns:
         list: All the filenames in the given directory
     """
-    if ext and "." not in ext:
-        ext = f".{ext.strip()}"
-    blacklist = [".DS_Store"]
+    if ext:
+        ext = ext.strip()
+    blacklist = [] if ext or prefix else [".DS_Store"]
 
     try:
-        if keep_ext:
-            if ext and prefix:
-                return [
-                    i for i in os.listdir(dirpath)
-                    if i.startswith(prefix) and i.endswith(ext)
-                ]
-            elif ext:
-                return [i for i in os.listdir(dirpath) if i.endswith(ext)]
-            elif prefix:
-                return [i for i in os.listdir(dirpath) if i.startswith(prefix)]
-            else:
-                return [i for i in os.listdir(dirpath) if i not in blacklist]
-        else:
-            if ext and prefix:
-                return [
-                    i.rsplit(".", 1)[0] for i in os.listdir(dirpath)
-                    if i.startswith(prefix) and i.endswith(ext)
-                ]
-            elif ext:
-                return [i.rsplit(".", 1)[0] for i in os.listdir(dirpath) if i.endswith(ext)]
-            elif prefix:
-                return [i.rsplit(".", 1)[0] for i in os.listdir(dirpath) if i.startswith(prefix)]
-            else:
-                return [i.rsplit(".", 1)[0] for i in os.listdir(dirpath) if i not in blacklist]
+        names = iterfiles(
+            dirpath, ext=ext and [ext], prefix=prefix, include_dirs=True, full_path=full_path
+        )
+        names = [i for i in names if os.path.basename(i) not in blacklist]
     except FileNotFoundError:
         if raise_err:
             raise FileNotFoundError
@@ -1158,6 +2823,12 @@ def filelist(dirpath, ext=None, prefix=None, raise_err=False, keep_ext=True):
             red("<b>Can't locate directory</b>")
             return None
 
+    if not keep_ext:
+        names = [
+            os.path.join(os.path.dirname(i), os.path.basename(i).rsplit(".", 1)[0]) for i in names
+        ]
+    return names
+
 
 def is_jupyter():
     """